@@ -1,18 +1,19 @@
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel, HttpUrl, Field
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from pydantic import BaseModel, HttpUrl, Field, TypeAdapter, ValidationError
 from typing import Optional, Literal, List, Dict, Union
 import os
 import re
 import tempfile
 import shutil
-import math
+import glob
 from dotenv import load_dotenv
 import openai
+import httpx
 import google.generativeai as genai
-import requests
-import json
+import orjson
 import yt_dlp
 import ffmpeg
 from enum import Enum
@@ -20,7 +21,11 @@ import PyPDF2
 import io
 import asyncio
 import aiofiles
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import functools
+import hashlib
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
 import time
 
 # Load environment variables
@@ -31,14 +36,83 @@ OPENAI_TIMEOUT = 600  # 10 minutes for OpenAI API calls
 WHISPER_TIMEOUT = 600  # 10 minutes for Whisper transcription
 DOWNLOAD_TIMEOUT = 600  # 10 minutes for video downloads
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE", os.path.join(tempfile.gettempdir(), "interview_audio_cache"))
+AUDIO_CACHE_MAX_ENTRIES = int(os.getenv("AUDIO_CACHE_MAX_ENTRIES", "32"))  # LRU by mtime
+MEDIA_WORKERS = int(os.getenv("MEDIA_WORKERS", "4"))  # Threads reserved for download/ffmpeg work
+# Files at or under this size transcribe in-process with faster-whisper when
+# the package is installed (0 disables the shortcut)
+LOCAL_WHISPER_THRESHOLD_BYTES = int(os.getenv("LOCAL_WHISPER_THRESHOLD_BYTES", "0"))
+# Clips shorter than this are rejected before any transcription spend
+MIN_AUDIO_DURATION_SECONDS = float(os.getenv("MIN_AUDIO_DURATION_SECONDS", "5"))
+OPENAI_MAX_CONCURRENCY = 8  # Process-wide cap on in-flight OpenAI calls
+OPENAI_MIN_REMAINING_TOKENS = 2000  # Throttle when the TPM budget runs this low
+FORMAT_CACHE_MAX_ENTRIES = 256  # In-process LRU cache for formatted transcripts
+FORMAT_MODEL = os.getenv("FORMAT_MODEL", "gpt-4o-mini")  # Formatting is a cheap task
+STRUCTURED_MODEL = os.getenv("STRUCTURED_MODEL", "gpt-4o-mini")  # Extraction-style tasks: skills, Q&A, comparisons
+INSIGHTS_MODEL = os.getenv("INSIGHTS_MODEL", "gpt-4o")  # Judgement-heavy insights and the combined analysis
+
+# Static instruction text kept byte-identical across requests, with the
+# per-request variables appended after it, so repeated formatting calls share
+# a stable prompt prefix (provider prompt caching keys on exact prefixes)
+FORMAT_PROMPT_DETAILED = (
+    "Please format this interview transcript into a clear, well-structured format "
+    "with proper paragraphs and speaker identification where possible, "
+    "Dont include any other text in the response, just the formatted transcript. "
+    "Dont use markdown formatting."
+)
+FORMAT_PROMPT_SIMPLE = "Please format this interview transcript into a clear, well-structured format."
+FORMAT_MAP_REDUCE_THRESHOLD = 12_000  # Chars; longer transcripts are summarized map-reduce style
+TRANSCRIPT_CACHE_MAX_ENTRIES = 64  # In-process LRU cache for Whisper transcripts
+ANALYSIS_CACHE_MAX_ENTRIES = 128  # In-process LRU cache for interview analysis results
+
+MAX_WHISPER_UPLOAD_BYTES = 25 * 1024 * 1024  # OpenAI Whisper per-file upload cap
+
+# Transcription backend selection:
+#   openai     - OpenAI-hosted Whisper (default; 25MB cap, chunking applies)
+#   compatible - any OpenAI-compatible transcription endpoint (Together,
+#                Groq, Baseten, self-hosted) via WHISPER_BASE_URL; these
+#                accept much larger files so chunking is skipped
+#   local      - faster-whisper running in-process (requires the optional
+#                faster-whisper package)
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "openai")
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "whisper-1")
+WHISPER_BASE_URL = os.getenv("WHISPER_BASE_URL")
+
+# Containers the Whisper API accepts directly (no transcode needed)
+WHISPER_AUDIO_FORMATS = {'.flac', '.m4a', '.mp3', '.mp4', '.mpeg', '.mpga', '.oga', '.ogg', '.wav', '.webm'}
 
 app = FastAPI(
     title="AI Interview Analysis API",
     description="Comprehensive AI-powered interview analysis with skill assessment and insights",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for web applications
+class SSEAwareGZipMiddleware:
+    """GZip everything except the SSE endpoint.
+
+    The pinned starlette's GZipMiddleware funnels streamed chunks through a
+    GzipFile that only flushes on close, so progress events would sit in
+    zlib's buffer until the stream ends — defeating incremental delivery,
+    which matters more than wire size for the event stream.
+    """
+    def __init__(self, app, minimum_size: int = 500):
+        self.app = app
+        self.gzip_app = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope.get("type") == "http" and scope.get("path") in SSE_PATHS:
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip_app(scope, receive, send)
+
+# Paths that stream server-sent events and must never be gzip-buffered
+SSE_PATHS = frozenset({"/extract-transcript-stream"})
+
+# Transcript-heavy JSON responses compress 5-10x; tiny payloads skip it
+app.add_middleware(SSEAwareGZipMiddleware, minimum_size=2048)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -47,6 +121,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject oversized uploads from the declared Content-Length before any body
+# bytes are read; the streaming caps in the handlers stay as the backstop for
+# chunked or lying clients. The slack covers multipart framing overhead.
+MAX_REQUEST_BODY_BYTES = MAX_FILE_SIZE + 1024 * 1024
+
+@app.middleware("http")
+async def limit_request_body(request: Request, call_next):
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_REQUEST_BODY_BYTES:
+        return ORJSONResponse(
+            status_code=413,
+            content={"detail": f"File too large. Maximum size allowed is {MAX_FILE_SIZE // (1024 * 1024)}MB"}
+        )
+    return await call_next(request)
+
 # Enums for structured responses
 class SkillLevel(str, Enum):
     BEGINNER = "Beginner"
@@ -99,6 +188,39 @@ class InterviewInsights(BaseModel):
     hiring_recommendation: str
     next_steps: List[str] = Field(default_factory=list)
 
+# Batch validators backed by pydantic-core; validating a whole list in one
+# call is much cheaper than per-item model construction in a Python loop
+_SKILLS_ADAPTER = TypeAdapter(List[SkillAssessment])
+_QA_ADAPTER = TypeAdapter(List[QuestionAnswer])
+
+def _validate_skill_assessments(items: list) -> List[SkillAssessment]:
+    """Validate a list of assessment dicts, dropping any malformed entries"""
+    try:
+        return _SKILLS_ADAPTER.validate_python(items)
+    except ValidationError:
+        skill_assessments = []
+        for assessment in items:
+            try:
+                skill_assessments.append(SkillAssessment(**assessment))
+            except Exception as e:
+                print(f"Error parsing skill assessment: {e}")
+                continue
+        return skill_assessments
+
+def _validate_qa_pairs(items: list) -> List[QuestionAnswer]:
+    """Validate a list of Q&A dicts, dropping any malformed entries"""
+    try:
+        return _QA_ADAPTER.validate_python(items)
+    except ValidationError:
+        qa_pairs = []
+        for qa in items:
+            try:
+                qa_pairs.append(QuestionAnswer(**qa))
+            except Exception as e:
+                print(f"Error parsing Q&A pair: {e}")
+                continue
+        return qa_pairs
+
 class TranscriptRequest(BaseModel):
     video_url: str
     ai_provider: Literal["openai", "gemini"] = "openai"
@@ -164,82 +286,348 @@ class ComparisonResponse(BaseModel):
     detailed_comparison: List[DetailedComparison]
     recommendations: ComparisonRecommendations
 
+# Shared API clients, created lazily once and reused so every call rides the
+# same TLS connection pool instead of paying handshake + DNS per request
+_openai_client: Optional[openai.OpenAI] = None
+_openai_async_client: Optional[openai.AsyncOpenAI] = None
+_gemini_model = None
+
+def _parse_reset_interval(value: str) -> float:
+    """Parse OpenAI rate-limit reset strings like '1s', '6m0s' or '120ms'"""
+    total = 0.0
+    for amount, unit in re.findall(r'([\d.]+)(ms|s|m|h)', value):
+        total += float(amount) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}[unit]
+    return total or 1.0
+
+class OpenAIRateLimiter:
+    """Bounded-concurrency gate that also respects OpenAI rate-limit headers
+    
+    Used as an async context manager around each API call; after the call,
+    feed the raw response headers to update_from_headers so upcoming calls
+    pause until the budget resets instead of burning retries on 429s.
+    """
+    def __init__(self, max_concurrency: int):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._resume_at = 0.0
+    
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+    
+    def update_from_headers(self, headers) -> None:
+        try:
+            remaining_tokens = int(headers.get('x-ratelimit-remaining-tokens', '1000000'))
+            remaining_requests = int(headers.get('x-ratelimit-remaining-requests', '1000000'))
+        except (TypeError, ValueError):
+            return
+        if remaining_tokens < OPENAI_MIN_REMAINING_TOKENS or remaining_requests < 2:
+            reset = headers.get('x-ratelimit-reset-tokens', '1s')
+            self._resume_at = time.monotonic() + _parse_reset_interval(reset)
+
+_openai_limiter = OpenAIRateLimiter(OPENAI_MAX_CONCURRENCY)
+
+def _tuned_http_client() -> httpx.AsyncClient:
+    """Connection-pool-tuned transport for the OpenAI SDK.
+
+    The SDK default httpx client caps the pool low enough that fan-out
+    from asyncio.gather queues behind it at high concurrency; size the
+    pool past OPENAI_MAX_CONCURRENCY with keep-alive headroom so every
+    in-flight completion gets a warm connection.
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=5.0),
+    )
+
+def get_openai_client() -> openai.OpenAI:
+    """Shared sync OpenAI client"""
+    global _openai_client
+    if _openai_client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise HTTPException(status_code=500, detail="OpenAI API key not configured.")
+        _openai_client = openai.OpenAI(api_key=api_key, timeout=OPENAI_TIMEOUT)
+    return _openai_client
+
+def get_async_openai_client() -> openai.AsyncOpenAI:
+    """Shared async OpenAI client"""
+    global _openai_async_client
+    if _openai_async_client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise HTTPException(status_code=500, detail="OpenAI API key not configured.")
+        _openai_async_client = openai.AsyncOpenAI(
+            api_key=api_key, timeout=OPENAI_TIMEOUT, http_client=_tuned_http_client()
+        )
+    return _openai_async_client
+
+_whisper_client: Optional[openai.AsyncOpenAI] = None
+_local_whisper_model = None
+
+def get_whisper_client() -> openai.AsyncOpenAI:
+    """Client for the configured transcription backend"""
+    global _whisper_client
+    if WHISPER_BACKEND == "openai":
+        return get_async_openai_client()
+    if _whisper_client is None:
+        api_key = os.getenv("WHISPER_API_KEY") or os.getenv("OPENAI_API_KEY")
+        if not api_key or not WHISPER_BASE_URL:
+            raise HTTPException(
+                status_code=500,
+                detail="WHISPER_BACKEND=compatible requires WHISPER_BASE_URL and WHISPER_API_KEY."
+            )
+        _whisper_client = openai.AsyncOpenAI(
+            api_key=api_key, base_url=WHISPER_BASE_URL, timeout=WHISPER_TIMEOUT,
+            http_client=_tuned_http_client()
+        )
+    return _whisper_client
+
+def _transcribe_local_sync(audio_file_path: str) -> str:
+    """Transcribe in-process with faster-whisper (int8 CTranslate2)"""
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        raise HTTPException(
+            status_code=500,
+            detail="WHISPER_BACKEND=local requires the faster-whisper package."
+        )
+    global _local_whisper_model
+    if _local_whisper_model is None:
+        _local_whisper_model = WhisperModel(
+            os.getenv("LOCAL_WHISPER_MODEL", "base"), compute_type="int8"
+        )
+    # Skip silent stretches before decoding; interviews carry plenty of
+    # pauses and Whisper otherwise hallucinates text over them
+    segments, _ = _local_whisper_model.transcribe(
+        audio_file_path, vad_filter=True, vad_parameters={"min_silence_duration_ms": 500}
+    )
+    return " ".join(segment.text.strip() for segment in segments)
+
+def _local_whisper_available() -> bool:
+    """True when faster-whisper can be imported"""
+    try:
+        import faster_whisper  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def get_gemini_model():
+    """Shared Gemini model (genai.configure runs once)"""
+    global _gemini_model
+    if _gemini_model is None:
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise HTTPException(status_code=500, detail="Gemini API key not configured.")
+        genai.configure(api_key=api_key)
+        _gemini_model = genai.GenerativeModel('gemini-pro')
+    return _gemini_model
+
 # Utility functions
+
+# Compiled once at import so each request skips regex compilation
+VIDEO_ID_PATTERNS = [
+    re.compile(r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([a-zA-Z0-9_-]{11})'),
+    re.compile(r'youtube\.com/v/([a-zA-Z0-9_-]{11})'),
+]
+
 def extract_video_id_from_url(url: str) -> Optional[str]:
     """Extract video ID from URL for reference (optional)"""
-    patterns = [
-        r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([a-zA-Z0-9_-]{11})',
-        r'youtube\.com/v/([a-zA-Z0-9_-]{11})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in VIDEO_ID_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
     
     return None
 
-def download_audio_from_url(video_url: str) -> str:
-    """Download audio from video URL using yt-dlp with timeout"""
+# Dedicated bounded pool for yt-dlp and ffmpeg orchestration so a burst of
+# transcribe requests cannot exhaust the loop's shared default executor. The
+# work is subprocess/network waiting rather than GIL-bound Python, so threads
+# (not a process pool) are the right vehicle — no pickling, shared temp paths.
+MEDIA_EXECUTOR = ThreadPoolExecutor(max_workers=MEDIA_WORKERS, thread_name_prefix="media")
+
+async def _run_media_task(func, *args):
+    """Run a blocking download/ffmpeg helper on the media executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(MEDIA_EXECUTOR, functools.partial(func, *args))
+
+def _audio_cache_path(video_url: str) -> str:
+    """Cache location for a URL's audio, keyed by video id (or URL hash)"""
+    video_id = extract_video_id_from_url(video_url)
+    if not video_id:
+        video_id = hashlib.blake2b(video_url.encode(), digest_size=16).hexdigest()
+    return os.path.join(AUDIO_CACHE_DIR, video_id)
+
+def _audio_cache_lookup(video_url: str, temp_dir: str) -> Optional[str]:
+    """Copy a previously downloaded audio file into temp_dir, if cached"""
+    prefix = _audio_cache_path(video_url)
+    for cached in glob.glob(glob.escape(prefix) + '.*'):
+        local_path = os.path.join(temp_dir, 'audio' + os.path.splitext(cached)[1])
+        try:
+            shutil.copy(cached, local_path)
+            # Refresh mtime so eviction treats this entry as recently used
+            os.utime(cached)
+            return local_path
+        except OSError as e:
+            print(f"Audio cache read failed: {e}")
+    return None
+
+def _audio_cache_store(video_url: str, audio_path: str) -> None:
+    """Keep a copy of the downloaded audio for future requests"""
     try:
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp()
+        os.makedirs(AUDIO_CACHE_DIR, exist_ok=True)
+        cached = _audio_cache_path(video_url) + os.path.splitext(audio_path)[1]
+        shutil.copy(audio_path, cached)
         
-        # Configure yt-dlp options with error handling and timeout
+        # Evict least-recently-used entries beyond the cap
+        entries = sorted(glob.glob(os.path.join(AUDIO_CACHE_DIR, '*')), key=os.path.getmtime)
+        for stale in entries[:-AUDIO_CACHE_MAX_ENTRIES]:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+    except OSError as e:
+        print(f"Audio cache write failed: {e}")
+
+def _download_audio_sync(video_url: str, temp_dir: str) -> str:
+    """Blocking yt-dlp download, run in a worker thread via download_audio_from_url"""
+    try:
+        # Configure yt-dlp options with error handling and timeout. Prefer
+        # audio-only containers Whisper accepts as-is so no re-encode pass
+        # is needed after download.
         ydl_opts = {
-            'format': 'bestaudio/best',
+            'format': 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best',
             'outtmpl': os.path.join(temp_dir, 'audio.%(ext)s'),
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '192',
-            }],
             'quiet': True,
             'no_warnings': True,
             'socket_timeout': DOWNLOAD_TIMEOUT,
             'retries': 3,
+            # Fetch DASH/HLS fragments in parallel; throttled CDNs cap each
+            # connection, not the sum of them
+            'concurrent_fragment_downloads': 4,
+            # Ranged requests for single-file sources: lets the native
+            # downloader resume mid-file and dodges per-connection throttling
+            'http_chunk_size': 10 * 1024 * 1024,
         }
         
+        # aria2c opens parallel byte-range connections for plain HTTP streams
+        # too; use it when the binary is around
+        if shutil.which('aria2c'):
+            ydl_opts['external_downloader'] = 'aria2c'
+            ydl_opts['external_downloader_args'] = {'aria2c': ['-x', '8', '-s', '8', '-k', '1M']}
+
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             try:
-                # Set a timeout for the download
-                import signal
-                
-                def timeout_handler(signum, frame):
-                    raise TimeoutError("Download timeout")
-                
-                signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(DOWNLOAD_TIMEOUT)
-                
-                try:
-                    info = ydl.extract_info(video_url, download=True)
-                finally:
-                    signal.alarm(0)  # Cancel the alarm
-                    
-            except TimeoutError:
-                raise HTTPException(
-                    status_code=408, 
-                    detail="Video download timeout. Please try with a shorter video or check the URL."
-                )
+                info = ydl.extract_info(video_url, download=True)
             except Exception as download_error:
                 raise Exception(f"Download failed: {str(download_error)}")
-            
-        # Find the downloaded file
-        audio_files = []
-        for file in os.listdir(temp_dir):
-            if file.endswith(('.mp3', '.m4a', '.webm', '.ogg')):
-                audio_files.append(os.path.join(temp_dir, file))
-        
-        if not audio_files:
+
+            # yt-dlp already knows the exact file it wrote; no need to scan
+            # the temp directory
+            requested = info.get('requested_downloads') or []
+            if requested and requested[0].get('filepath'):
+                audio_path = requested[0]['filepath']
+            else:
+                # Fallback for older yt-dlp versions
+                audio_path = ydl.prepare_filename(info)
+
+        if not audio_path or not os.path.exists(audio_path):
             raise Exception("No audio file found after download")
-        
-        return audio_files[0]
-        
+
+        # Transcode only when the downloaded container is one Whisper rejects
+        if os.path.splitext(audio_path)[1].lower() not in WHISPER_AUDIO_FORMATS:
+            mp3_path = os.path.splitext(audio_path)[0] + '.mp3'
+            (
+                ffmpeg
+                .input(audio_path)
+                .output(mp3_path, acodec='mp3', audio_bitrate='192k')
+                .overwrite_output()
+                .run(quiet=True)
+            )
+            os.remove(audio_path)
+            audio_path = mp3_path
+
+        return audio_path
+
     except HTTPException:
         raise
     except Exception as e:
         raise Exception(f"Audio download error: {str(e)}")
 
+# Concurrent requests for the same video share one download: the first
+# request does the work, later arrivals wait on its future and then copy
+# the finished file out of the audio cache into their own temp_dir
+_inflight_downloads: Dict[str, asyncio.Future] = {}
+
+async def download_audio_from_url(video_url: str, temp_dir: str) -> str:
+    """Download audio from video URL into temp_dir without blocking the event loop
+
+    Hits the on-disk audio cache first so repeat requests for the same video
+    skip the download entirely; concurrent requests for the same video are
+    deduplicated onto a single download.
+    """
+    try:
+        cached = await _run_media_task(_audio_cache_lookup, video_url, temp_dir)
+        if cached is not None:
+            return cached
+        
+        inflight_key = _audio_cache_path(video_url)
+        pending = _inflight_downloads.get(inflight_key)
+        if pending is not None:
+            # Another request is already downloading this video; wait for it
+            # and pick the result up from the cache (shielded so one client
+            # disconnecting does not cancel the shared download)
+            if await asyncio.shield(pending):
+                cached = await _run_media_task(_audio_cache_lookup, video_url, temp_dir)
+                if cached is not None:
+                    return cached
+            # Download failed or the cache entry was already evicted —
+            # fall through and download independently
+        
+        future = asyncio.get_running_loop().create_future()
+        _inflight_downloads[inflight_key] = future
+        try:
+            audio_path = await asyncio.wait_for(
+                _run_media_task(_download_audio_sync, video_url, temp_dir),
+                timeout=DOWNLOAD_TIMEOUT
+            )
+            await _run_media_task(_audio_cache_store, video_url, audio_path)
+            future.set_result(True)
+            return audio_path
+        except BaseException:
+            # Waiters retry on their own; a plain False avoids the
+            # "exception was never retrieved" warning when nobody waits
+            future.set_result(False)
+            raise
+        finally:
+            _inflight_downloads.pop(inflight_key, None)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=408,
+            detail="Video download timeout. Please try with a shorter video or check the URL."
+        )
+
+def _detect_silence_points(audio_file_path: str) -> List[float]:
+    """Find silence timestamps with a single ffmpeg silencedetect pass"""
+    try:
+        _, stderr = (
+            ffmpeg
+            .input(audio_file_path)
+            .output('pipe:', format='null', af='silencedetect=noise=-35dB:d=0.5')
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+        return [
+            float(value)
+            for value in re.findall(r'silence_end:\s*([0-9.]+)', stderr.decode('utf-8', 'ignore'))
+        ]
+    except Exception:
+        return []
+
 def split_audio_file(audio_file_path: str, max_size_mb: int = 25) -> List[str]:
     """Split audio file into chunks if it's larger than max_size_mb"""
     file_size = os.path.getsize(audio_file_path)
@@ -248,79 +636,291 @@ def split_audio_file(audio_file_path: str, max_size_mb: int = 25) -> List[str]:
     if file_size <= max_size_bytes:
         return [audio_file_path]  # No need to split
     
-    # Calculate number of chunks needed
-    num_chunks = math.ceil(file_size / max_size_bytes)
-    
-    # Get audio duration using ffmpeg
+    # Get audio duration, codec and real bitrate with a single ffmpeg probe
+    codec_name = None
+    bit_rate = None
     try:
         probe = ffmpeg.probe(audio_file_path)
         duration = float(probe['streams'][0]['duration'])
+        codec_name = probe['streams'][0].get('codec_name')
+        bit_rate = int(probe['format']['bit_rate'])
     except:
         # Fallback: estimate based on file size
         duration = file_size / (128 * 1024 / 8)  # Assume 128kbps
     
-    chunk_duration = duration / num_chunks
+    if not bit_rate:
+        # Derive the average bitrate from size and duration
+        bit_rate = int(file_size * 8 / duration) if duration else 128 * 1024
+    
+    # Size each chunk from the bitrate it will be *written* at, with 5%
+    # headroom so no chunk overshoots the Whisper upload cap and forces a
+    # reject-and-retry. mp3 sources are stream-copied, so their own bitrate
+    # applies; everything else (e.g. the 32k Opus from
+    # _compress_audio_for_whisper) is re-encoded to 128k mp3 below, and
+    # sizing from a lower source bitrate would overshoot the cap
+    output_bit_rate = bit_rate if codec_name == 'mp3' else 128 * 1024
+    chunk_duration = (max_size_bytes * 8 / output_bit_rate) * 0.95
+    
+    # Snap each cut point to a nearby silence so chunks don't break
+    # mid-sentence, which degrades Whisper accuracy at the seams. Only
+    # silences at or before the target boundary are considered so the
+    # size cap still holds.
+    silence_points = _detect_silence_points(audio_file_path)
+    segment_times = []
+    boundary = chunk_duration
+    while boundary < duration:
+        candidates = [
+            point for point in silence_points
+            if boundary - chunk_duration * 0.25 <= point <= boundary
+        ]
+        cut = max(candidates) if candidates else boundary
+        if not segment_times or cut > segment_times[-1]:
+            segment_times.append(cut)
+        boundary = cut + chunk_duration
     
-    # Split the audio file
-    chunk_files = []
     temp_dir = os.path.dirname(audio_file_path)
     base_name = os.path.splitext(os.path.basename(audio_file_path))[0]
+    chunk_pattern = os.path.join(temp_dir, f"{base_name}_chunk_%03d.mp3")
     
-    for i in range(num_chunks):
-        start_time = i * chunk_duration
-        chunk_file = os.path.join(temp_dir, f"{base_name}_chunk_{i+1}.mp3")
+    # Split in a single pass with ffmpeg's segment muxer: one sequential read
+    # of the source instead of one seeking read per chunk. Stream copy when
+    # the source is already MP3 so no re-encode pass is needed.
+    try:
+        stream = ffmpeg.input(audio_file_path)
+        segment_opts = {'f': 'segment', 'reset_timestamps': 1}
+        if segment_times:
+            segment_opts['segment_times'] = ','.join(f'{t:.3f}' for t in segment_times)
+        else:
+            segment_opts['segment_time'] = chunk_duration
+        if codec_name == 'mp3':
+            output = stream.output(chunk_pattern, c='copy', map='0:a', **segment_opts)
+        else:
+            output = stream.output(chunk_pattern, acodec='mp3', audio_bitrate='128k', map='0:a', **segment_opts)
+        output.overwrite_output().run(quiet=True)
         
-        try:
-            (
-                ffmpeg
-                .input(audio_file_path, ss=start_time, t=chunk_duration)
-                .output(chunk_file, acodec='mp3', audio_bitrate='128k')
-                .overwrite_output()
-                .run(quiet=True)
-            )
-            chunk_files.append(chunk_file)
-        except Exception as e:
-            # Clean up on error
-            for cf in chunk_files:
-                if os.path.exists(cf):
-                    os.remove(cf)
-            raise Exception(f"Failed to split audio file: {str(e)}")
+        chunk_files = sorted(glob.glob(os.path.join(temp_dir, f"{base_name}_chunk_*.mp3")))
+        if not chunk_files:
+            raise Exception("segment muxer produced no chunks")
+    except Exception as e:
+        # Clean up on error
+        for cf in glob.glob(os.path.join(temp_dir, f"{base_name}_chunk_*.mp3")):
+            try:
+                os.remove(cf)
+            except FileNotFoundError:
+                pass
+        raise Exception(f"Failed to split audio file: {str(e)}")
     
     return chunk_files
 
-def transcribe_with_whisper(audio_file_path: str) -> tuple[str, int]:
-    """Transcribe audio file using OpenAI Whisper API, handling large files with timeout"""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="OpenAI API key not configured.")
+# Transcripts keyed by audio content hash so re-submitting the same audio
+# (or retrying after a partial failure) skips paid Whisper calls
+_transcript_cache: OrderedDict = OrderedDict()
+
+def _hash_file(path: str) -> str:
+    """Hash file contents in fixed-size blocks (blake2b: fast and stdlib)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while block := f.read(1024 * 1024):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _transcript_cache_get(key: str):
+    cached = _transcript_cache.get(key)
+    if cached is not None:
+        _transcript_cache.move_to_end(key)
+    return cached
+
+def _read_file_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _transcript_cache_put(key: str, value) -> None:
+    _transcript_cache[key] = value
+    _transcript_cache.move_to_end(key)
+    while len(_transcript_cache) > TRANSCRIPT_CACHE_MAX_ENTRIES:
+        _transcript_cache.popitem(last=False)
+
+def _compress_audio_for_whisper(audio_file_path: str) -> str:
+    """Re-encode audio to 16kHz mono Opus to shrink the Whisper upload
     
-    client = openai.OpenAI(api_key=api_key, timeout=WHISPER_TIMEOUT)
+    Whisper's quality saturates at 16kHz mono, so a 32k Opus stream carries
+    the same usable signal as a 192kbps stereo MP3 at a fraction of the
+    bytes — usually small enough that no chunking is needed at all.
+    """
+    ogg_path = os.path.splitext(audio_file_path)[0] + '_16k.ogg'
+    (
+        ffmpeg
+        .input(audio_file_path)
+        .output(ogg_path, ac=1, ar=16000, acodec='libopus', audio_bitrate='32k')
+        .overwrite_output()
+        .run(quiet=True)
+    )
+    try:
+        os.remove(audio_file_path)
+    except FileNotFoundError:
+        pass
+    return ogg_path
+
+async def _whisper_request(client: openai.AsyncOpenAI, upload) -> str:
+    """One Whisper API call through the rate limiter, with backoff retries"""
+    for attempt in range(3):
+        try:
+            async with _openai_limiter:
+                raw = await client.audio.transcriptions.with_raw_response.create(
+                    model=WHISPER_MODEL,
+                    file=upload,
+                    response_format="text"
+                )
+            _openai_limiter.update_from_headers(raw.headers)
+            return raw.parse()
+        except (openai.RateLimitError, openai.InternalServerError):
+            if attempt == 2:
+                raise
+            await asyncio.sleep(2 ** attempt)
+
+async def _transcribe_chunk(
+    client: openai.AsyncOpenAI,
+    chunk_file: str,
+    chunk_index: int,
+    total_chunks: int
+) -> str:
+    """Transcribe a single audio chunk from an in-memory buffer"""
+    # Read once: the same bytes feed the cache key and the upload, and a
+    # retried upload never depends on a consumed file handle
+    data = await asyncio.to_thread(_read_file_bytes, chunk_file)
+    chunk_key = "chunk:" + hashlib.blake2b(data, digest_size=16).hexdigest()
+    cached = _transcript_cache_get(chunk_key)
+    if cached is not None:
+        return cached
     
+    print(f"Transcribing chunk {chunk_index + 1}/{total_chunks}...")
+    response = await _whisper_request(client, (os.path.basename(chunk_file), data))
+    _transcript_cache_put(chunk_key, response)
+    return response
+
+def _probe_audio_duration(audio_file_path: str) -> Optional[float]:
+    """Duration in seconds via ffmpeg probe, or None if the probe fails"""
     try:
-        # Split file if needed
-        chunk_files = split_audio_file(audio_file_path)
-        transcriptions = []
-        
-        for i, chunk_file in enumerate(chunk_files):
-            print(f"Transcribing chunk {i+1}/{len(chunk_files)}...")
+        probe = ffmpeg.probe(audio_file_path)
+        return float(probe['format']['duration'])
+    except Exception:
+        return None
+
+async def transcribe_with_whisper(audio_file_path: str, enforce_min_duration: bool = False) -> tuple[str, int]:
+    """Transcribe audio file, fanning chunks out concurrently
+    
+    The caller owns audio_file_path and its directory; everything this
+    function writes (chunks, compressed copies) lands in that same
+    directory, so a TemporaryDirectory at the call site cleans up all of it.
+    
+    enforce_min_duration is set by the analyze endpoints, where a clip this
+    short can never pass validate_transcript_quality and would waste the
+    Whisper spend plus the analysis calls behind it. Plain transcription
+    endpoints leave it off — a 4-second clip is a legitimate transcription.
+    """
+    if enforce_min_duration:
+        duration = await _run_media_task(_probe_audio_duration, audio_file_path)
+        if duration is not None and duration < MIN_AUDIO_DURATION_SECONDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Audio too short for analysis ({duration:.1f}s); minimum is {MIN_AUDIO_DURATION_SECONDS:.0f}s"
+            )
+    
+    try:
+        if WHISPER_BACKEND == "local":
+            full_transcript = await asyncio.to_thread(_transcribe_local_sync, audio_file_path)
             
+            if not full_transcript.strip():
+                raise HTTPException(status_code=500, detail="No transcript generated. Please check the audio file.")
+            
+            return full_transcript, 1
+        
+        # Short clips spend more time on the upload round-trip than on
+        # transcription itself; run them in-process when the opt-in threshold
+        # is set and faster-whisper is installed, falling back to the API on
+        # any local failure
+        if (
+            LOCAL_WHISPER_THRESHOLD_BYTES
+            and os.path.getsize(audio_file_path) <= LOCAL_WHISPER_THRESHOLD_BYTES
+            and _local_whisper_available()
+        ):
             try:
-                with open(chunk_file, "rb") as audio_file:
-                    response = client.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=audio_file,
-                        response_format="text"
-                    )
-                    transcriptions.append(response)
-            except TimeoutError:
-                raise HTTPException(
-                    status_code=408, 
-                    detail=f"Transcription timeout for chunk {i+1}. Please try with a shorter audio file."
-                )
-            except Exception as chunk_error:
-                print(f"Error transcribing chunk {i+1}: {chunk_error}")
-                # Continue with other chunks instead of failing completely
+                full_transcript = await asyncio.to_thread(_transcribe_local_sync, audio_file_path)
+                if full_transcript.strip():
+                    return full_transcript, 1
+            except Exception as local_error:
+                print(f"Warning: local transcription failed, using remote backend: {local_error}")
+        
+        client = get_whisper_client()
+        
+        # Shrink oversized uploads first; the compressed file usually fits
+        # under the cap, skipping the whole split-and-chunk path. Compatible
+        # backends accept large files directly, so neither step applies.
+        if WHISPER_BACKEND == "openai" and os.path.getsize(audio_file_path) > MAX_WHISPER_UPLOAD_BYTES:
+            try:
+                audio_file_path = await _run_media_task(_compress_audio_for_whisper, audio_file_path)
+            except Exception as compress_error:
+                print(f"Warning: audio compression failed, splitting instead: {compress_error}")
+        
+        # Single-upload path: anything under the cap, plus any size on
+        # compatible backends (they accept large files directly)
+        if WHISPER_BACKEND != "openai" or os.path.getsize(audio_file_path) <= MAX_WHISPER_UPLOAD_BYTES:
+            if os.path.getsize(audio_file_path) <= MAX_WHISPER_UPLOAD_BYTES:
+                # Small file: read the bytes once and hand the in-memory
+                # buffer straight to Whisper — no second disk read, and the
+                # same bytes feed the cache hash
+                data = await asyncio.to_thread(_read_file_bytes, audio_file_path)
+                audio_key = "audio:" + hashlib.blake2b(data, digest_size=16).hexdigest()
+                upload = (os.path.basename(audio_file_path), data)
+            else:
+                # Large file on a compatible backend: hash in fixed blocks
+                # and stream the upload from the handle so a 100MB file is
+                # never buffered whole in RAM
+                audio_key = "audio:" + await asyncio.to_thread(_hash_file, audio_file_path)
+                upload = None
+            cached = _transcript_cache_get(audio_key)
+            if cached is not None:
+                return cached
+            
+            if upload is not None:
+                full_transcript = await _whisper_request(client, upload)
+            else:
+                with open(audio_file_path, 'rb') as audio_file:
+                    full_transcript = await _whisper_request(client, audio_file)
+            
+            if not full_transcript.strip():
+                raise HTTPException(status_code=500, detail="No transcript generated. Please check the audio file.")
+            
+            _transcript_cache_put(audio_key, (full_transcript, 1))
+            return full_transcript, 1
+        
+        # Whole-file cache hit: skip splitting and transcription entirely
+        audio_key = "audio:" + await asyncio.to_thread(_hash_file, audio_file_path)
+        cached = _transcript_cache_get(audio_key)
+        if cached is not None:
+            return cached
+        
+        # Split file if needed
+        chunk_files = await _run_media_task(split_audio_file, audio_file_path)
+        
+        # Transcribe all chunks concurrently; the process-wide limiter keeps
+        # the fan-out inside OpenAI's rate limits
+        results = await asyncio.gather(
+            *[
+                _transcribe_chunk(client, chunk_file, i, len(chunk_files))
+                for i, chunk_file in enumerate(chunk_files)
+            ],
+            return_exceptions=True
+        )
+        
+        # Reassemble in chunk order, degrading gracefully on per-chunk failures
+        transcriptions = []
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                print(f"Error transcribing chunk {i+1}: {result}")
                 transcriptions.append(f"[Error transcribing chunk {i+1}]")
+            else:
+                transcriptions.append(result)
         
         # Combine all transcriptions
         full_transcript = " ".join(transcriptions)
@@ -328,103 +928,269 @@ def transcribe_with_whisper(audio_file_path: str) -> tuple[str, int]:
         if not full_transcript.strip():
             raise HTTPException(status_code=500, detail="No transcript generated. Please check the audio file.")
         
+        # Only cache fully successful transcriptions at the file level
+        if not any(isinstance(result, Exception) for result in results):
+            _transcript_cache_put(audio_key, (full_transcript, len(chunk_files)))
+        
         return full_transcript, len(chunk_files)
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Whisper transcription error: {str(e)}")
-    finally:
-        # Clean up all files
-        try:
-            if audio_file_path and os.path.exists(audio_file_path):
-                os.remove(audio_file_path)
-            
-            # Clean up chunk files if they exist
-            temp_dir = os.path.dirname(audio_file_path) if audio_file_path else None
-            if temp_dir and os.path.exists(temp_dir):
-                for file in os.listdir(temp_dir):
-                    if file.endswith('_chunk_') and file.endswith('.mp3'):
-                        chunk_path = os.path.join(temp_dir, file)
-                        if os.path.exists(chunk_path):
-                            os.remove(chunk_path)
-                
-                # Clean up temp directory if empty
-                try:
-                    os.rmdir(temp_dir)
-                except:
-                    pass
-        except Exception as cleanup_error:
-            print(f"Warning: Cleanup failed: {cleanup_error}")
-
-def format_with_openai(transcript: str, prompt: str) -> str:
-    """Format transcript using OpenAI API with timeout"""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="OpenAI API key not configured.")
-    
-    client = openai.OpenAI(api_key=api_key, timeout=OPENAI_TIMEOUT)
+
+# Content-addressed cache so identical (model, prompt, transcript) requests
+# skip the chat completion entirely
+_format_cache: OrderedDict = OrderedDict()
+
+def _format_cache_key(model: str, prompt: str, transcript: str) -> str:
+    """Content-addressed cache key for formatted transcripts"""
+    return hashlib.blake2b(
+        f"{model}|{prompt}|{transcript}".encode(), digest_size=16
+    ).hexdigest()
+
+def _format_cache_get(key: str) -> Optional[str]:
+    cached = _format_cache.get(key)
+    if cached is not None:
+        _format_cache.move_to_end(key)
+    return cached
+
+def _format_cache_put(key: str, value: str) -> None:
+    _format_cache[key] = value
+    _format_cache.move_to_end(key)
+    while len(_format_cache) > FORMAT_CACHE_MAX_ENTRIES:
+        _format_cache.popitem(last=False)
+
+async def _format_chat_completion(transcript: str, prompt: str) -> str:
+    """One formatting completion on the shared async client, under the limiter"""
+    client = get_async_openai_client()
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that formats and summarizes video transcripts."},
-                {"role": "user", "content": f"{prompt}\n\nTranscript:\n{transcript}"}
-            ],
-            max_tokens=1500,
-            temperature=0.7
-        )
+        async with _openai_limiter:
+            response = await client.chat.completions.create(
+                model=FORMAT_MODEL,
+                messages=[
+                    # Instructions live in the system message so the mostly-static
+                    # prefix stays byte-identical across requests and hits
+                    # OpenAI's automatic prompt cache; only the transcript varies
+                    {"role": "system", "content": f"You are a helpful assistant that formats and summarizes video transcripts. {prompt}"},
+                    {"role": "user", "content": f"Transcript:\n{transcript}"}
+                ],
+                max_tokens=1500,
+                temperature=0  # Formatting is deterministic cleanup, not generation
+            )
         return response.choices[0].message.content
-    except TimeoutError:
+    except openai.APITimeoutError:
         raise HTTPException(status_code=408, detail="OpenAI API timeout. Please try again.")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"OpenAI API error: {str(e)}")
 
-def format_with_gemini(transcript: str, prompt: str) -> str:
-    """Format transcript using Google Gemini API"""
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="Gemini API key not configured.")
+def _split_on_sentences(text: str, max_chars: int) -> List[str]:
+    """Split text into pieces of at most ~max_chars on sentence boundaries"""
+    pieces = []
+    current = []
+    length = 0
+    for sentence in re.split(r'(?<=[.!?])\s+', text):
+        if length + len(sentence) > max_chars and current:
+            pieces.append(' '.join(current))
+            current = []
+            length = 0
+        current.append(sentence)
+        length += len(sentence) + 1
+    if current:
+        pieces.append(' '.join(current))
+    return pieces
+
+async def format_with_openai(transcript: str, prompt: str) -> str:
+    """Format transcript using OpenAI API without blocking the event loop
+    
+    Long transcripts are handled map-reduce style: each piece is summarized
+    concurrently, then a final call applies the caller's prompt to the
+    combined partials, so latency and prompt size stay bounded regardless of
+    audio length.
+    """
+    key = _format_cache_key(f"openai/{FORMAT_MODEL}", prompt, transcript)
+    cached = _format_cache_get(key)
+    if cached is not None:
+        return cached
     
-    genai.configure(api_key=api_key)
+    if len(transcript) > FORMAT_MAP_REDUCE_THRESHOLD:
+        pieces = _split_on_sentences(transcript, FORMAT_MAP_REDUCE_THRESHOLD)
+        # Each piece acquires _openai_limiter inside _format_chat_completion,
+        # so the fan-out stays within the process-wide concurrency cap no
+        # matter how long the transcript is
+        partials = await asyncio.gather(*[
+            _format_chat_completion(
+                piece,
+                "Summarize this portion of a longer transcript, keeping every substantive point."
+            )
+            for piece in pieces
+        ])
+        formatted = await _format_chat_completion("\n\n".join(partials), prompt)
+    else:
+        formatted = await _format_chat_completion(transcript, prompt)
+    
+    _format_cache_put(key, formatted)
+    return formatted
+
+def _format_with_gemini_sync(transcript: str, prompt: str) -> str:
+    """Blocking Gemini formatting call, run in a worker thread via format_with_gemini"""
+    model = get_gemini_model()
     
     try:
-        model = genai.GenerativeModel('gemini-pro')
         full_prompt = f"{prompt}\n\nTranscript:\n{transcript}"
         response = model.generate_content(full_prompt)
         return response.text
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gemini API error: {str(e)}")
 
+async def stream_format_with_openai(transcript: str, prompt: str):
+    """Yield formatted-transcript tokens as they arrive from OpenAI
+    
+    Generation settings, message layout and long-transcript map-reduce
+    mirror _format_chat_completion / format_with_openai exactly — both
+    paths share one format cache key, so they must produce the same output
+    for the same inputs.
+    """
+    client = get_async_openai_client()
+    
+    if len(transcript) > FORMAT_MAP_REDUCE_THRESHOLD:
+        pieces = _split_on_sentences(transcript, FORMAT_MAP_REDUCE_THRESHOLD)
+        partials = await asyncio.gather(*[
+            _format_chat_completion(
+                piece,
+                "Summarize this portion of a longer transcript, keeping every substantive point."
+            )
+            for piece in pieces
+        ])
+        transcript = "\n\n".join(partials)
+    
+    try:
+        # Hold the limiter for the whole stream: the completion occupies an
+        # API slot until the last token arrives, not just during setup
+        async with _openai_limiter:
+            stream = await client.chat.completions.create(
+                model=FORMAT_MODEL,
+                messages=[
+                    {"role": "system", "content": f"You are a helpful assistant that formats and summarizes video transcripts. {prompt}"},
+                    {"role": "user", "content": f"Transcript:\n{transcript}"}
+                ],
+                max_tokens=1500,
+                temperature=0,  # Formatting is deterministic cleanup, not generation
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"OpenAI API error: {str(e)}")
+
+async def format_with_gemini(transcript: str, prompt: str) -> str:
+    """Format transcript using Google Gemini API without blocking the event loop"""
+    key = _format_cache_key("gemini/gemini-pro", prompt, transcript)
+    cached = _format_cache_get(key)
+    if cached is not None:
+        return cached
+    formatted = await asyncio.to_thread(_format_with_gemini_sync, transcript, prompt)
+    _format_cache_put(key, formatted)
+    return formatted
+
+# Hoisted request-validation constants and helpers shared by the endpoints
+ALLOWED_AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.mp4', '.avi', '.mov', '.webm'})
+ALLOWED_MEDIA_EXTENSIONS = ALLOWED_AUDIO_EXTENSIONS | {'.mkv'}
+_SKILL_SPLIT_RE = re.compile(r'\s*,\s*')
+
+def parse_skills(skills_to_assess: str) -> List[str]:
+    """Split and validate the comma-separated skills form field"""
+    skills_list = [skill for skill in _SKILL_SPLIT_RE.split(skills_to_assess.strip()) if skill]
+    if not skills_list:
+        raise HTTPException(status_code=400, detail="At least one skill must be provided")
+    
+    if len(skills_list) > 20:
+        raise HTTPException(status_code=400, detail="Maximum 20 skills allowed per analysis")
+    
+    return skills_list
+
+# Compiled once at import; validation then needs one scan per check instead
+# of one full pass per indicator
+TRANSCRIPT_ERROR_RE = re.compile(r'\[inaudible\]|\[unclear\]|\?\?\?|\.{9,}', re.IGNORECASE)
+TRANSCRIPT_QUESTION_RE = re.compile(r'\?|tell me|describe|explain|what is|how do|why', re.IGNORECASE)
+
 def validate_transcript_quality(transcript: str) -> tuple[bool, str]:
     """Validate if transcript is suitable for analysis"""
     if not transcript or len(transcript.strip()) < 50:
         return False, "Transcript too short for meaningful analysis"
     
     # Check for common transcription errors
-    error_indicators = ["[inaudible]", "[unclear]", "???", "..." * 3]
-    error_count = sum(transcript.lower().count(indicator) for indicator in error_indicators)
+    error_count = sum(1 for _ in TRANSCRIPT_ERROR_RE.finditer(transcript))
+    
+    # Approximate word count without materializing the split list
+    word_count = transcript.count(' ') + 1
     
-    if error_count > len(transcript.split()) * 0.1:  # More than 10% errors
+    if error_count > word_count * 0.1:  # More than 10% errors
         return False, "Transcript quality too poor for reliable analysis"
     
     # Check if it looks like an interview (has questions)
-    question_indicators = ["?", "tell me", "describe", "explain", "what is", "how do", "why"]
-    has_questions = any(indicator in transcript.lower() for indicator in question_indicators)
-    
-    if not has_questions:
+    if TRANSCRIPT_QUESTION_RE.search(transcript) is None:
         return False, "Content does not appear to be an interview format"
     
     return True, "Transcript quality acceptable"
 
-def assess_skills_with_openai(transcript: str, skills: List[str], job_role: str = "Software Developer") -> List[SkillAssessment]:
-    """Assess skills from transcript using OpenAI structured response"""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="OpenAI API key not configured.")
-    
-    client = openai.OpenAI(api_key=api_key)
+def needs_formatting(text: str) -> bool:
+    """Heuristic check for whether a transcript needs the formatting LLM pass.
+
+    Whisper output arrives as one unbroken wall of text, but transcripts
+    coming in through the PDF/text upload path are often already clean
+    paragraphs — formatting those again is a wasted round-trip.
+    """
+    lines = text.split("\n")
+    paragraph_lines = sum(1 for line in lines if 60 < len(line.strip()) < 1000)
+    if paragraph_lines < max(3, len(lines) * 0.3):
+        return True
+    # Prose should end sentences with punctuation early on
+    if not any(line.strip().endswith(('.', '!', '?')) for line in lines[:20]):
+        return True
+    return False
+
+# Interview analyses are deterministic enough at temperature=0.3 that re-running
+# the same transcript with the same parameters is wasted spend — cache the
+# parsed response dict keyed by content hash
+_analysis_cache: OrderedDict = OrderedDict()
+
+def _analysis_cache_key(model: str, job_role: str, skills_text: str, transcript: str) -> str:
+    """Content-addressed cache key for interview analysis results"""
+    return hashlib.blake2b(
+        f"{model}|{job_role}|{skills_text}|{transcript}".encode(), digest_size=16
+    ).hexdigest()
+
+def _analysis_cache_get(key: str):
+    cached = _analysis_cache.get(key)
+    if cached is not None:
+        _analysis_cache.move_to_end(key)
+    return cached
+
+def _analysis_cache_put(key: str, value) -> None:
+    _analysis_cache[key] = value
+    _analysis_cache.move_to_end(key)
+    while len(_analysis_cache) > ANALYSIS_CACHE_MAX_ENTRIES:
+        _analysis_cache.popitem(last=False)
+
+async def analyze_interview_with_openai(
+    transcript: str,
+    skills: List[str],
+    job_role: str = "Software Developer"
+) -> tuple[List[SkillAssessment], List[QuestionAnswer], InterviewInsights]:
+    """Run skill assessment, Q&A extraction and insights in one structured call
+
+    The transcript dominates the prompt for all three analyses, so sending it
+    once with a combined schema costs a third of the prompt tokens and one
+    round-trip instead of three.
+    """
+    client = get_async_openai_client()
     
     # Validate inputs
     if not skills:
@@ -435,274 +1201,195 @@ def assess_skills_with_openai(transcript: str, skills: List[str], job_role: str
     
     skills_text = ", ".join(skills)
     
+    cache_key = _analysis_cache_key(INSIGHTS_MODEL, job_role, skills_text, transcript)
+    cached = _analysis_cache_get(cache_key)
+    
     try:
-        response = client.chat.completions.create(
-            model="gpt-4.1",  # Using GPT-4 for better analysis
-            messages=[
-                {
-                    "role": "system", 
-                    "content": f"""You are an expert technical interviewer analyzing a {job_role} interview transcript. 
-                    Assess each skill based on evidence in the transcript. Be thorough but fair in your assessment.
-                    If a skill is not mentioned or demonstrated, mark it as 'Not Demonstrated'.
-                    Provide specific evidence and actionable recommendations."""
-                },
-                {
-                    "role": "user", 
-                    "content": f"""Please assess the following skills based on this interview transcript: {skills_text}
-
-For each skill, provide:
-1. Skill level (Beginner/Intermediate/Advanced/Expert/Not Demonstrated)
-2. Confidence score (0-100)
-3. Specific evidence from the transcript
-4. Recommendations for improvement
-
-Transcript:
-{transcript}"""
-                }
-            ],
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "skill_assessment",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "assessments": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "skill": {"type": "string"},
-                                        "level": {
-                                            "type": "string",
-                                            "enum": ["Beginner", "Intermediate", "Advanced", "Expert", "Not Demonstrated"]
-                                        },
-                                        "confidence_score": {"type": "number", "minimum": 0, "maximum": 100},
-                                        "evidence": {"type": "string"},
-                                        "recommendations": {"type": "string"}
-                                    },
-                                    "required": ["skill", "level", "confidence_score", "evidence", "recommendations"]
-                                }
-                            }
+        if cached is not None:
+            result = cached
+        else:
+            async with _openai_limiter:
+                response = await client.chat.completions.create(
+                    model=INSIGHTS_MODEL,
+                    messages=[
+                        {
+                            "role": "system", 
+                            "content": f"""You are an expert technical interviewer and senior HR professional analyzing a {job_role} interview transcript.
+                            You will perform three analyses on the same transcript: skill assessment, question/answer grading, and overall interview insights.
+                            Be thorough, objective and constructive; provide specific evidence and actionable feedback.
+                            If a skill is not mentioned or demonstrated, mark it as 'Not Demonstrated'."""
                         },
-                        "required": ["assessments"]
-                    }
-                }
-            },
-            temperature=0.3
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        
-        # Validate and convert to SkillAssessment objects
-        skill_assessments = []
-        for assessment in result["assessments"]:
-            try:
-                skill_assessments.append(SkillAssessment(**assessment))
-            except Exception as e:
-                print(f"Error parsing skill assessment: {e}")
-                continue
-        
-        return skill_assessments
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Skill assessment error: {str(e)}")
+                        {
+                            "role": "user", 
+                            "content": f"""Please analyze this interview transcript in three parts.
 
-def extract_qa_with_openai(transcript: str, job_role: str = "Software Developer") -> List[QuestionAnswer]:
-    """Extract and grade Q&A pairs from transcript using OpenAI"""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="OpenAI API key not configured.")
-    
-    client = openai.OpenAI(api_key=api_key)
-    
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": f"""You are an expert technical interviewer analyzing a {job_role} interview transcript.
-                    Extract all question-answer pairs and grade each answer objectively.
-                    Focus on technical accuracy, communication clarity, and completeness of answers."""
-                },
-                {
-                    "role": "user", 
-                    "content": f"""Please extract all interview questions and answers from this transcript and grade each answer.
-
-For each Q&A pair, provide:
-1. The exact question asked
-2. The candidate's complete answer
-3. Grade (Excellent/Good/Average/Below Average/Poor)
-4. Numerical score (0-100)
-5. Detailed feedback
-6. Key points the candidate covered well
-7. Areas for improvement
+Part 1 - Assess the following skills: {skills_text}
+For each skill, provide the skill level (Beginner/Intermediate/Advanced/Expert/Not Demonstrated), a confidence score (0-100), specific evidence from the transcript, and recommendations for improvement.
+
+Part 2 - Extract all interview questions and answers and grade each answer.
+For each Q&A pair, provide the exact question, the candidate's complete answer, a grade (Excellent/Good/Average/Below Average/Poor), a numerical score (0-100), detailed feedback, key points covered, and areas for improvement.
+
+Part 3 - Provide comprehensive interview insights: overall performance metrics (0-100 scores), strengths and weaknesses, communication and technical analysis, cultural fit indicators, red flags, hiring recommendation, and next steps.
 
 Transcript:
 {transcript}"""
-                }
-            ],
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "qa_extraction",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "qa_pairs": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "question": {"type": "string"},
-                                        "answer": {"type": "string"},
-                                        "grade": {
-                                            "type": "string",
-                                            "enum": ["Excellent", "Good", "Average", "Below Average", "Poor"]
-                                        },
-                                        "score": {"type": "number", "minimum": 0, "maximum": 100},
-                                        "feedback": {"type": "string"},
-                                        "key_points_covered": {
-                                            "type": "array",
-                                            "items": {"type": "string"}
-                                        },
-                                        "areas_for_improvement": {
-                                            "type": "array",
-                                            "items": {"type": "string"}
+                        }
+                    ],
+                    response_format={
+                        "type": "json_schema",
+                        "json_schema": {
+                            "name": "interview_analysis",
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "assessments": {
+                                        "type": "array",
+                                        "items": {
+                                            "type": "object",
+                                            "properties": {
+                                                "skill": {"type": "string"},
+                                                "level": {
+                                                    "type": "string",
+                                                    "enum": ["Beginner", "Intermediate", "Advanced", "Expert", "Not Demonstrated"]
+                                                },
+                                                "confidence_score": {"type": "number", "minimum": 0, "maximum": 100},
+                                                "evidence": {"type": "string"},
+                                                "recommendations": {"type": "string"}
+                                            },
+                                            "required": ["skill", "level", "confidence_score", "evidence", "recommendations"]
+                                        }
+                                    },
+                                    "qa_pairs": {
+                                        "type": "array",
+                                        "items": {
+                                            "type": "object",
+                                            "properties": {
+                                                "question": {"type": "string"},
+                                                "answer": {"type": "string"},
+                                                "grade": {
+                                                    "type": "string",
+                                                    "enum": ["Excellent", "Good", "Average", "Below Average", "Poor"]
+                                                },
+                                                "score": {"type": "number", "minimum": 0, "maximum": 100},
+                                                "feedback": {"type": "string"},
+                                                "key_points_covered": {
+                                                    "type": "array",
+                                                    "items": {"type": "string"}
+                                                },
+                                                "areas_for_improvement": {
+                                                    "type": "array",
+                                                    "items": {"type": "string"}
+                                                }
+                                            },
+                                            "required": ["question", "answer", "grade", "score", "feedback", "key_points_covered", "areas_for_improvement"]
                                         }
                                     },
-                                    "required": ["question", "answer", "grade", "score", "feedback", "key_points_covered", "areas_for_improvement"]
-                                }
+                                    "insights": {
+                                        "type": "object",
+                                        "properties": {
+                                            "overall_performance_score": {"type": "number", "minimum": 0, "maximum": 100},
+                                            "communication_clarity": {"type": "number", "minimum": 0, "maximum": 100},
+                                            "technical_depth": {"type": "number", "minimum": 0, "maximum": 100},
+                                            "problem_solving_ability": {"type": "number", "minimum": 0, "maximum": 100},
+                                            "confidence_level": {"type": "number", "minimum": 0, "maximum": 100},
+                                            "strengths": {"type": "array", "items": {"type": "string"}},
+                                            "weaknesses": {"type": "array", "items": {"type": "string"}},
+                                            "key_achievements_mentioned": {"type": "array", "items": {"type": "string"}},
+                                            "red_flags": {"type": "array", "items": {"type": "string"}},
+                                            "interview_duration_analysis": {"type": "string"},
+                                            "speech_patterns": {"type": "string"},
+                                            "engagement_level": {"type": "string"},
+                                            "cultural_fit_indicators": {"type": "array", "items": {"type": "string"}},
+                                            "hiring_recommendation": {"type": "string"},
+                                            "next_steps": {"type": "array", "items": {"type": "string"}}
+                                        },
+                                        "required": [
+                                            "overall_performance_score", "communication_clarity", "technical_depth",
+                                            "problem_solving_ability", "confidence_level", "strengths", "weaknesses",
+                                            "key_achievements_mentioned", "red_flags", "interview_duration_analysis",
+                                            "speech_patterns", "engagement_level", "cultural_fit_indicators",
+                                            "hiring_recommendation", "next_steps"
+                                        ]
+                                    }
+                                },
+                                "required": ["assessments", "qa_pairs", "insights"]
                             }
-                        },
-                        "required": ["qa_pairs"]
-                    }
-                }
-            },
-            temperature=0.3
-        )
-        
-        result = json.loads(response.choices[0].message.content)
+                        }
+                    },
+                    temperature=0.3
+                )
+            
+            result = orjson.loads(response.choices[0].message.content)
+            _analysis_cache_put(cache_key, result)
         
-        # Validate and convert to QuestionAnswer objects
-        qa_pairs = []
-        for qa in result["qa_pairs"]:
-            try:
-                qa_pairs.append(QuestionAnswer(**qa))
-            except Exception as e:
-                print(f"Error parsing Q&A pair: {e}")
-                continue
+        # Validate and convert to response models
+        skill_assessments = _validate_skill_assessments(result["assessments"])
+        qa_pairs = _validate_qa_pairs(result["qa_pairs"])
+        insights = InterviewInsights(**result["insights"])
         
-        return qa_pairs
+        return skill_assessments, qa_pairs, insights
         
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Q&A extraction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Interview analysis error: {str(e)}")
 
-def generate_interview_insights_with_openai(transcript: str, job_role: str = "Software Developer") -> InterviewInsights:
-    """Generate comprehensive interview insights using OpenAI"""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="OpenAI API key not configured.")
+def render_analysis_summary_template(
+    skill_assessments: List[SkillAssessment], 
+    qa_pairs: List[QuestionAnswer], 
+    insights: InterviewInsights,
+    job_role: str = "Software Developer"
+) -> str:
+    """Render the executive summary from already-computed analysis fields
+
+    The summary only restates scores, top strengths/weaknesses and the hiring
+    recommendation, all of which the structured analysis already produced — a
+    template covers it at zero latency and token cost.
+    """
+    avg_skill_score = sum(sa.confidence_score for sa in skill_assessments) / len(skill_assessments) if skill_assessments else 0
+    avg_qa_score = sum(qa.score for qa in qa_pairs) / len(qa_pairs) if qa_pairs else 0
     
-    client = openai.OpenAI(api_key=api_key)
+    strengths = ', '.join(insights.strengths[:3]) or 'none identified'
+    weaknesses = ', '.join(insights.weaknesses[:3]) or 'none identified'
     
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": f"""You are a senior HR professional and technical interview expert analyzing a {job_role} interview.
-                    Provide comprehensive insights covering all aspects of the candidate's performance.
-                    Be objective, constructive, and provide actionable feedback."""
-                },
-                {
-                    "role": "user", 
-                    "content": f"""Please provide a comprehensive analysis of this interview transcript including:
-
-1. Overall performance metrics (0-100 scores)
-2. Strengths and weaknesses
-3. Communication and technical analysis
-4. Cultural fit indicators
-5. Red flags or concerns
-6. Hiring recommendation
-7. Next steps
-
-Transcript:
-{transcript}"""
-                }
-            ],
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "interview_insights",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "overall_performance_score": {"type": "number", "minimum": 0, "maximum": 100},
-                            "communication_clarity": {"type": "number", "minimum": 0, "maximum": 100},
-                            "technical_depth": {"type": "number", "minimum": 0, "maximum": 100},
-                            "problem_solving_ability": {"type": "number", "minimum": 0, "maximum": 100},
-                            "confidence_level": {"type": "number", "minimum": 0, "maximum": 100},
-                            "strengths": {"type": "array", "items": {"type": "string"}},
-                            "weaknesses": {"type": "array", "items": {"type": "string"}},
-                            "key_achievements_mentioned": {"type": "array", "items": {"type": "string"}},
-                            "red_flags": {"type": "array", "items": {"type": "string"}},
-                            "interview_duration_analysis": {"type": "string"},
-                            "speech_patterns": {"type": "string"},
-                            "engagement_level": {"type": "string"},
-                            "cultural_fit_indicators": {"type": "array", "items": {"type": "string"}},
-                            "hiring_recommendation": {"type": "string"},
-                            "next_steps": {"type": "array", "items": {"type": "string"}}
-                        },
-                        "required": [
-                            "overall_performance_score", "communication_clarity", "technical_depth",
-                            "problem_solving_ability", "confidence_level", "strengths", "weaknesses",
-                            "key_achievements_mentioned", "red_flags", "interview_duration_analysis",
-                            "speech_patterns", "engagement_level", "cultural_fit_indicators",
-                            "hiring_recommendation", "next_steps"
-                        ]
-                    }
-                }
-            },
-            temperature=0.3
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        return InterviewInsights(**result)
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Interview insights generation error: {str(e)}")
+    return (
+        f"The candidate was assessed for a {job_role} position and achieved an overall "
+        f"performance score of {insights.overall_performance_score:.0f}/100, with an average "
+        f"skill assessment score of {avg_skill_score:.1f}/100 across {len(skill_assessments)} "
+        f"evaluated skills and an average answer score of {avg_qa_score:.1f}/100 over "
+        f"{len(qa_pairs)} interview questions.\n\n"
+        f"Key strengths observed: {strengths}. "
+        f"Main areas for improvement: {weaknesses}. "
+        f"Communication clarity scored {insights.communication_clarity:.0f}/100 and technical "
+        f"depth {insights.technical_depth:.0f}/100.\n\n"
+        f"Hiring recommendation: {insights.hiring_recommendation}"
+    )
 
-def generate_analysis_summary_with_openai(
+async def generate_analysis_summary_with_openai(
     skill_assessments: List[SkillAssessment], 
     qa_pairs: List[QuestionAnswer], 
     insights: InterviewInsights,
     job_role: str = "Software Developer"
 ) -> str:
     """Generate a comprehensive analysis summary"""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="OpenAI API key not configured.")
-    
-    client = openai.OpenAI(api_key=api_key)
+    client = get_async_openai_client()
     
     # Prepare summary data
     avg_skill_score = sum(sa.confidence_score for sa in skill_assessments) / len(skill_assessments) if skill_assessments else 0
     avg_qa_score = sum(qa.score for qa in qa_pairs) / len(qa_pairs) if qa_pairs else 0
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": f"You are an expert HR analyst creating an executive summary for a {job_role} interview analysis."
-                },
-                {
-                    "role": "user", 
-                    "content": f"""Create a comprehensive executive summary based on this interview analysis:
+        async with _openai_limiter:
+            response = await client.chat.completions.create(
+                model=FORMAT_MODEL,
+                messages=[
+                    {
+                        "role": "system", 
+                        "content": f"You are an expert HR analyst creating an executive summary for a {job_role} interview analysis."
+                    },
+                    {
+                        "role": "user", 
+                        "content": f"""Create a comprehensive executive summary based on this interview analysis:
 
 Average Skill Assessment Score: {avg_skill_score:.1f}/100
 Average Q&A Performance Score: {avg_qa_score:.1f}/100
@@ -713,230 +1400,292 @@ Key Weaknesses: {', '.join(insights.weaknesses[:3])}
 Hiring Recommendation: {insights.hiring_recommendation}
 
 Please provide a 2-3 paragraph executive summary suitable for hiring managers."""
-                }
-            ],
-            max_tokens=500,
-            temperature=0.7
-        )
+                    }
+                ],
+                max_tokens=500,
+                temperature=0.7
+            )
         
         return response.choices[0].message.content
         
     except Exception as e:
         return f"Summary generation failed: {str(e)}"
 
+# Compiled once for the PDF cleanup pass
+_MULTI_NEWLINE_RE = re.compile(r'\n{3,}')
+_MULTI_WHITESPACE_RE = re.compile(r'\s{2,}')
+
+# Optional native-code PDF backend; PyPDF2 stays as the pure-Python fallback
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+def _extract_pdf_pages_pdfium(file_content: bytes) -> List[str]:
+    """Extract page text with pypdfium2 (PDFium C++, ~10-30x faster than PyPDF2)"""
+    pdf = pdfium.PdfDocument(io.BytesIO(file_content))
+    try:
+        return [pdf[i].get_textpage().get_text_range() for i in range(len(pdf))]
+    finally:
+        pdf.close()
+
 def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from a PDF file using PyPDF2"""
+    """Extract text from a PDF file, preferring the native pypdfium2 backend"""
     try:
-        # Create a PDF reader object
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+        text = None
+        if pdfium is not None:
+            try:
+                text = _extract_pdf_pages_pdfium(file_content)
+            except Exception as pdfium_error:
+                print(f"Warning: pypdfium2 extraction failed, falling back to PyPDF2: {pdfium_error}")
         
-        # Extract text from all pages
-        text = []
-        for page in pdf_reader.pages:
-            text.append(page.extract_text())
+        if text is None:
+            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+            text = [page.extract_text() for page in pdf_reader.pages]
         
         # Join all text together
         full_text = "\n".join(text)
         
         # Basic cleanup
         # Remove excessive newlines
-        full_text = re.sub(r'\n{3,}', '\n\n', full_text)
+        full_text = _MULTI_NEWLINE_RE.sub('\n\n', full_text)
         # Remove excessive whitespace
-        full_text = re.sub(r'\s{2,}', ' ', full_text)
+        full_text = _MULTI_WHITESPACE_RE.sub(' ', full_text)
         
         return full_text.strip()
     except Exception as e:
         raise Exception(f"Failed to extract text from PDF: {str(e)}")
 
 # Additional utility functions for PDF comparison
-def download_pdf_from_url(url: str) -> bytes:
-    """Download PDF file from URL"""
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared pooled HTTP client for plain downloads (PDFs etc.)"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            follow_redirects=True,
+        )
+    return _http_client
+
+@app.on_event("shutdown")
+async def _close_http_client():
+    if _http_client is not None:
+        await _http_client.aclose()
+
+async def download_pdf_from_url(url: str) -> bytes:
+    """Download PDF file from URL, streaming chunks instead of buffering the response"""
     try:
-        response = requests.get(url)
-        if response.status_code != 200:
-            raise Exception(f"Failed to download PDF. Status code: {response.status_code}")
-        
-        return response.content
+        async with get_http_client().stream("GET", url) as response:
+            if response.status_code != 200:
+                raise Exception(f"Failed to download PDF. Status code: {response.status_code}")
+            
+            buf = io.BytesIO()
+            async for chunk in response.aiter_bytes(chunk_size=1 << 16):
+                buf.write(chunk)
+            return buf.getvalue()
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to download PDF: {str(e)}")
 
-def compare_analyses_with_openai(original_text: str, ai_text: str) -> ComparisonResponse:
-    """Compare two interview analysis texts using OpenAI"""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="OpenAI API key not configured.")
-    
-    client = openai.OpenAI(api_key=api_key)
-    
-    try:
-        # Generate summary comparison
-        summary_response = client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": """You are an expert at comparing interview analyses. 
-                    Compare the original human analysis with the AI-generated analysis of the same interview transcript.
-                    Provide a fair, objective comparison highlighting similarities, differences, strengths and weaknesses of each approach."""
-                },
-                {
-                    "role": "user", 
-                    "content": f"""I have two analyses of the same interview transcript:
-                    
-                    ORIGINAL HUMAN ANALYSIS:
-                    {original_text}
-                    
-                    AI-GENERATED ANALYSIS:
-                    {ai_text}
-                    
-                    Please provide a summary comparison with:
-                    1. Overall comparison
-                    2. Agreement score (0-100%)
-                    3. Key similarities (list)
-                    4. Key differences (list)"""
-                }
-            ],
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "summary_comparison",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "overall_comparison": {"type": "string"},
-                            "agreement_score": {"type": "number", "minimum": 0, "maximum": 100},
-                            "key_similarities": {"type": "array", "items": {"type": "string"}},
-                            "key_differences": {"type": "array", "items": {"type": "string"}}
-                        },
-                        "required": ["overall_comparison", "agreement_score", "key_similarities", "key_differences"]
-                    }
-                }
+# Comparisons are expensive (three completions) and frequently repeated with
+# identical PDFs during testing — cache the finished response by content hash
+_comparison_cache: OrderedDict = OrderedDict()
+COMPARISON_CACHE_MAX_ENTRIES = 32
+
+def _comparison_cache_key(original_text: str, ai_text: str) -> str:
+    """Content-addressed cache key for comparison results"""
+    return hashlib.blake2b(
+        f"{STRUCTURED_MODEL}|{original_text}|{ai_text}".encode(), digest_size=16
+    ).hexdigest()
+
+def _comparison_cache_get(key: str) -> Optional[ComparisonResponse]:
+    cached = _comparison_cache.get(key)
+    if cached is not None:
+        _comparison_cache.move_to_end(key)
+    return cached
+
+def _comparison_cache_put(key: str, value: ComparisonResponse) -> None:
+    _comparison_cache[key] = value
+    _comparison_cache.move_to_end(key)
+    while len(_comparison_cache) > COMPARISON_CACHE_MAX_ENTRIES:
+        _comparison_cache.popitem(last=False)
+
+async def _limited_chat_completion(client: openai.AsyncOpenAI, **kwargs):
+    """One chat completion through the shared rate limiter"""
+    async with _openai_limiter:
+        return await client.chat.completions.create(**kwargs)
+
+def _comparison_request_body(original_text: str, ai_text: str) -> dict:
+    """Chat-completion payload for the fused comparison request.
+
+    Shared by the synchronous path and the Batch API path so both modes
+    send identical prompts and schemas.
+    """
+    return {
+        "model": STRUCTURED_MODEL,
+        "messages": [
+            {
+                "role": "system", 
+                "content": """You are an expert at comparing interview analyses.
+                Compare the original human analysis with the AI-generated analysis of the same interview transcript.
+                Be fair, objective, and constructive, highlighting similarities, differences, strengths and weaknesses of each approach.
+                You will produce three parts: a summary comparison, a detailed category-by-category comparison, and recommendations."""
             },
-            temperature=0.5
-        )
-        
-        summary = json.loads(summary_response.choices[0].message.content)
-        
-        # Generate detailed category comparisons
-        detailed_response = client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": """You are an expert at comparing interview analyses in detail.
-                    Compare the original human analysis with the AI-generated analysis across multiple categories.
-                    For each category, extract the relevant sections from each analysis and provide a detailed comparison."""
-                },
-                {
-                    "role": "user", 
-                    "content": f"""Compare these two analyses of the same interview transcript:
-                    
-                    ORIGINAL HUMAN ANALYSIS:
-                    {original_text}
-                    
-                    AI-GENERATED ANALYSIS:
-                    {ai_text}
-                    
-                    Please compare across these categories:
-                    1. Technical Skills Assessment
-                    2. Communication Skills
-                    3. Problem-solving Abilities
-                    4. Overall Performance
-                    5. Recommendations
-                    
-                    For each category, provide:
-                    - The relevant section from the original analysis
-                    - The relevant section from the AI analysis
-                    - A detailed comparison between them"""
-                }
-            ],
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "detailed_comparison",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "detailed_comparison": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "category": {"type": "string"},
-                                        "original": {"type": "string"},
-                                        "ai_generated": {"type": "string"},
-                                        "comparison": {"type": "string"}
-                                    },
-                                    "required": ["category", "original", "ai_generated", "comparison"]
-                                }
+            {
+                "role": "user", 
+                "content": f"""I have two analyses of the same interview transcript:
+
+ORIGINAL HUMAN ANALYSIS:
+{original_text}
+
+AI-GENERATED ANALYSIS:
+{ai_text}
+
+Part 1 - Summary comparison: overall comparison, agreement score (0-100%), key similarities (list), key differences (list).
+
+Part 2 - Detailed comparison across these categories: Technical Skills Assessment, Communication Skills, Problem-solving Abilities, Overall Performance, Recommendations. For each category, provide the relevant section from the original analysis, the relevant section from the AI analysis, and a detailed comparison between them.
+
+Part 3 - Recommendations: overall recommendation and insights, strengths of the original human analysis, strengths of the AI-generated analysis, and suggestions for improving both approaches."""
+            }
+        ],
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "analysis_comparison",
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "summary": {
+                            "type": "object",
+                            "properties": {
+                                "overall_comparison": {"type": "string"},
+                                "agreement_score": {"type": "number", "minimum": 0, "maximum": 100},
+                                "key_similarities": {"type": "array", "items": {"type": "string"}},
+                                "key_differences": {"type": "array", "items": {"type": "string"}}
+                            },
+                            "required": ["overall_comparison", "agreement_score", "key_similarities", "key_differences"]
+                        },
+                        "detailed_comparison": {
+                            "type": "array",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "category": {"type": "string"},
+                                    "original": {"type": "string"},
+                                    "ai_generated": {"type": "string"},
+                                    "comparison": {"type": "string"}
+                                },
+                                "required": ["category", "original", "ai_generated", "comparison"]
                             }
                         },
-                        "required": ["detailed_comparison"]
-                    }
+                        "recommendations": {
+                            "type": "object",
+                            "properties": {
+                                "overall": {"type": "string"},
+                                "original_strengths": {"type": "array", "items": {"type": "string"}},
+                                "ai_strengths": {"type": "array", "items": {"type": "string"}},
+                                "improvement_suggestions": {"type": "array", "items": {"type": "string"}}
+                            },
+                            "required": ["overall", "original_strengths", "ai_strengths", "improvement_suggestions"]
+                        }
+                    },
+                    "required": ["summary", "detailed_comparison", "recommendations"]
                 }
-            },
-            temperature=0.5
+            }
+        },
+        "temperature": 0.5,
+    }
+
+def _build_comparison_response(result_dict: dict) -> ComparisonResponse:
+    """Assemble a ComparisonResponse from the fused completion output"""
+    return ComparisonResponse(
+        summary=ComparisonSummary(**result_dict["summary"]),
+        detailed_comparison=result_dict["detailed_comparison"],
+        recommendations=ComparisonRecommendations(**result_dict["recommendations"])
+    )
+
+async def compare_analyses_with_openai(original_text: str, ai_text: str) -> ComparisonResponse:
+    """Compare two interview analysis texts using OpenAI"""
+    client = get_async_openai_client()
+    
+    cache_key = _comparison_cache_key(original_text, ai_text)
+    cached = _comparison_cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # The same document in both slots (a common UI-testing mistake) does
+    # not need an LLM to say so. Equality catches the exact case; for
+    # near-identity, quick_ratio is only an order-insensitive upper bound —
+    # same-template analyses with opposite conclusions clear 0.9 — so it
+    # serves purely as the cheap prefilter for a real ratio() over the full
+    # texts, off the event loop, with a threshold that only whitespace and
+    # extraction jitter should pass
+    if original_text == ai_text or (
+        SequenceMatcher(None, original_text[:5000], ai_text[:5000]).quick_ratio() > 0.95
+        and await asyncio.to_thread(
+            lambda: SequenceMatcher(None, original_text, ai_text).ratio()
+        ) > 0.99
+    ):
+        result = ComparisonResponse(
+            summary=ComparisonSummary(
+                overall_comparison="The two analyses are nearly identical documents, so there are no meaningful differences to compare.",
+                agreement_score=99,
+                key_similarities=["Both documents contain substantially the same content"],
+                key_differences=[],
+            ),
+            detailed_comparison=[],
+            recommendations=ComparisonRecommendations(
+                overall="The uploaded analyses appear to be the same document. Upload two distinct analyses for a meaningful comparison.",
+                original_strengths=[],
+                ai_strengths=[],
+                improvement_suggestions=["Verify that a different file was uploaded in each slot"],
+            ),
         )
-        
-        detailed = json.loads(detailed_response.choices[0].message.content)
-        
-        # Generate recommendations
-        recommendations_response = client.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": """You are an expert at evaluating interview analyses.
-                    After comparing the original human analysis with the AI-generated analysis, provide recommendations and insights.
-                    Be fair, objective, and constructive."""
-                },
-                {
-                    "role": "user", 
-                    "content": f"""Based on these two analyses of the same interview transcript:
-                    
-                    ORIGINAL HUMAN ANALYSIS:
-                    {original_text}
-                    
-                    AI-GENERATED ANALYSIS:
-                    {ai_text}
-                    
-                    Please provide:
-                    1. Overall recommendation and insights
-                    2. Strengths of the original human analysis
-                    3. Strengths of the AI-generated analysis
-                    4. Suggestions for improving both approaches"""
-                }
-            ],
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "comparison_recommendations",
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "overall": {"type": "string"},
-                            "original_strengths": {"type": "array", "items": {"type": "string"}},
-                            "ai_strengths": {"type": "array", "items": {"type": "string"}},
-                            "improvement_suggestions": {"type": "array", "items": {"type": "string"}}
-                        },
-                        "required": ["overall", "original_strengths", "ai_strengths", "improvement_suggestions"]
-                    }
-                }
-            },
-            temperature=0.5
+        _comparison_cache_put(cache_key, result)
+        return result
+    
+    try:
+        # One request with a combined schema: the two analysis texts dominate
+        # the prompt, so fusing summary, detailed comparison and
+        # recommendations pays their input tokens once instead of three times
+        response = await _limited_chat_completion(
+            client, **_comparison_request_body(original_text, ai_text)
         )
         
-        recommendations = json.loads(recommendations_response.choices[0].message.content)
-        
-        return ComparisonResponse(
-            summary=ComparisonSummary(**summary),
-            detailed_comparison=detailed["detailed_comparison"],
-            recommendations=ComparisonRecommendations(**recommendations)
-        )
+        result = _build_comparison_response(orjson.loads(response.choices[0].message.content))
+        _comparison_cache_put(cache_key, result)
+        return result
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Comparison analysis error: {str(e)}")
 
+async def submit_comparison_batch(original_text: str, ai_text: str) -> str:
+    """Submit a comparison via the OpenAI Batch API (24h window, 50% discount)"""
+    client = get_async_openai_client()
+    
+    line = {
+        "custom_id": f"comparison-{_comparison_cache_key(original_text, ai_text)}",
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": _comparison_request_body(original_text, ai_text),
+    }
+    
+    try:
+        batch_input = await client.files.create(
+            file=("comparison_batch.jsonl", orjson.dumps(line) + b"\n"),
+            purpose="batch",
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch submission error: {str(e)}")
+
 # API Endpoints
 @app.get("/", response_model=HealthResponse)
 async def root():
@@ -986,14 +1735,15 @@ async def extract_and_format_transcript(request: TranscriptRequest):
         
         # Use Whisper API for transcription
         print("Using Whisper API for transcription...")
-        audio_file_path = download_audio_from_url(request.video_url)
-        raw_transcript, num_chunks = transcribe_with_whisper(audio_file_path)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            audio_file_path = await download_audio_from_url(request.video_url, temp_dir)
+            raw_transcript, num_chunks = await transcribe_with_whisper(audio_file_path)
         
         # Format with AI
         if request.ai_provider == "openai":
-            formatted_response = format_with_openai(raw_transcript, request.format_prompt)
+            formatted_response = await format_with_openai(raw_transcript, request.format_prompt)
         elif request.ai_provider == "gemini":
-            formatted_response = format_with_gemini(raw_transcript, request.format_prompt)
+            formatted_response = await format_with_gemini(raw_transcript, request.format_prompt)
         else:
             raise HTTPException(status_code=400, detail="Invalid AI provider. Choose 'openai' or 'gemini'")
         
@@ -1005,6 +1755,9 @@ async def extract_and_format_transcript(request: TranscriptRequest):
             file_chunks=num_chunks
         )
         
+    except HTTPException:
+        # Re-raise HTTP exceptions as-is
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
@@ -1023,46 +1776,38 @@ async def upload_and_transcribe_audio(
     """
     try:
         # Validate file type
-        allowed_extensions = {'.mp3', '.wav', '.m4a', '.mp4', '.avi', '.mov', '.webm'}
         file_extension = os.path.splitext(file.filename)[1].lower()
         
-        if file_extension not in allowed_extensions:
-            raise HTTPException(status_code=400, detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}")
-        
-        # Check file size (100MB limit)
-        max_file_size = 100 * 1024 * 1024  # 100MB in bytes
-        file_size = 0
-        file_content = b""
-        
-        # Read file in chunks to get size and content
-        chunk_size = 1024 * 1024  # 1MB chunks
-        while chunk := await file.read(chunk_size):
-            file_size += len(chunk)
-            if file_size > max_file_size:
-                raise HTTPException(
-                    status_code=413, 
-                    detail=f"File too large. Maximum size allowed is 100MB, but file is {file_size / (1024*1024):.1f}MB"
-                )
-            file_content += chunk
-        
-        # Reset file position for processing
-        await file.seek(0)
+        if file_extension not in ALLOWED_AUDIO_EXTENSIONS:
+            raise HTTPException(status_code=400, detail=f"Unsupported file type. Allowed: {', '.join(sorted(ALLOWED_AUDIO_EXTENSIONS))}")
         
-        # Save uploaded file temporarily
-        temp_dir = tempfile.mkdtemp()
-        temp_file_path = os.path.join(temp_dir, file.filename)
-        
-        with open(temp_file_path, "wb") as buffer:
-            buffer.write(file_content)
-        
-        # Transcribe with Whisper
-        raw_transcript, num_chunks = transcribe_with_whisper(temp_file_path)
+        # Save uploaded file temporarily, streaming fixed-size chunks straight
+        # to disk so large uploads never accumulate in memory
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_file_path = os.path.join(temp_dir, os.path.basename(file.filename))
+            
+            max_file_size = 100 * 1024 * 1024  # 100MB in bytes
+            file_size = 0
+            chunk_size = 1024 * 1024  # 1MB chunks
+            
+            async with aiofiles.open(temp_file_path, "wb") as buffer:
+                while chunk := await file.read(chunk_size):
+                    file_size += len(chunk)
+                    if file_size > max_file_size:
+                        raise HTTPException(
+                            status_code=413, 
+                            detail=f"File too large. Maximum size allowed is 100MB, but file is {file_size / (1024*1024):.1f}MB"
+                        )
+                    await buffer.write(chunk)
+            
+            # Transcribe with Whisper
+            raw_transcript, num_chunks = await transcribe_with_whisper(temp_file_path)
         
         # Format with AI
         if ai_provider == "openai":
-            formatted_response = format_with_openai(raw_transcript, format_prompt)
+            formatted_response = await format_with_openai(raw_transcript, format_prompt)
         elif ai_provider == "gemini":
-            formatted_response = format_with_gemini(raw_transcript, format_prompt)
+            formatted_response = await format_with_gemini(raw_transcript, format_prompt)
         else:
             raise HTTPException(status_code=400, detail="Invalid AI provider. Choose 'openai' or 'gemini'")
         
@@ -1074,6 +1819,9 @@ async def upload_and_transcribe_audio(
             file_chunks=num_chunks
         )
         
+    except HTTPException:
+        # Re-raise HTTP exceptions as-is
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing audio file: {str(e)}")
 
@@ -1083,7 +1831,8 @@ async def analyze_interview_comprehensive(
     skills_to_assess: str = Form(..., description="Comma-separated list of skills to assess"),
     job_role: str = Form(default="Software Developer", description="Job role for context"),
     company_name: str = Form(default="Company", description="Company name for context"),
-    ai_provider: Literal["openai", "gemini"] = Form(default="openai")
+    ai_provider: Literal["openai", "gemini"] = Form(default="openai"),
+    summary_mode: Literal["template", "llm"] = Form(default="template", description="Render the executive summary from a template (fast, free) or with an extra LLM call")
 ):
     """
     Comprehensive interview analysis with skill assessment, Q&A extraction, and insights
@@ -1096,22 +1845,16 @@ async def analyze_interview_comprehensive(
     """
     try:
         # Validate file type
-        allowed_extensions = {'.mp3', '.wav', '.m4a', '.mp4', '.avi', '.mov', '.webm', '.mkv'}
         file_extension = os.path.splitext(file.filename)[1].lower()
         
-        if file_extension not in allowed_extensions:
+        if file_extension not in ALLOWED_MEDIA_EXTENSIONS:
             raise HTTPException(
                 status_code=400, 
-                detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+                detail=f"Unsupported file type. Allowed: {', '.join(sorted(ALLOWED_MEDIA_EXTENSIONS))}"
             )
         
         # Parse and validate skills
-        skills_list = [skill.strip() for skill in skills_to_assess.split(',') if skill.strip()]
-        if not skills_list:
-            raise HTTPException(status_code=400, detail="At least one skill must be provided")
-        
-        if len(skills_list) > 20:
-            raise HTTPException(status_code=400, detail="Maximum 20 skills allowed per analysis")
+        skills_list = parse_skills(skills_to_assess)
         
         # Validate AI provider for structured responses
         if ai_provider != "openai":
@@ -1120,68 +1863,62 @@ async def analyze_interview_comprehensive(
                 detail="Currently only OpenAI supports comprehensive structured analysis"
             )
         
-        # Check file size (100MB limit)
-        max_file_size = 100 * 1024 * 1024  # 100MB in bytes
-        file_size = 0
-        file_content = b""
-        
-        # Read file in chunks to get size and content
-        chunk_size = 1024 * 1024  # 1MB chunks
-        while chunk := await file.read(chunk_size):
-            file_size += len(chunk)
-            if file_size > max_file_size:
-                raise HTTPException(
-                    status_code=413, 
-                    detail=f"File too large. Maximum size allowed is 100MB, but file is {file_size / (1024*1024):.1f}MB"
-                )
-            file_content += chunk
-        
-        # Reset file position for processing
-        await file.seek(0)
-        
-        # Save uploaded file temporarily
-        temp_dir = tempfile.mkdtemp()
-        temp_file_path = os.path.join(temp_dir, file.filename)
-        
-        with open(temp_file_path, "wb") as buffer:
-            buffer.write(file_content)
-        
-        # Step 1: Transcribe with Whisper
-        print("Transcribing audio with Whisper...")
-        raw_transcript, num_chunks = transcribe_with_whisper(temp_file_path)
+        # Save uploaded file temporarily, streaming fixed-size chunks straight
+        # to disk so large uploads never accumulate in memory
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_file_path = os.path.join(temp_dir, os.path.basename(file.filename))
+            
+            max_file_size = 100 * 1024 * 1024  # 100MB in bytes
+            file_size = 0
+            chunk_size = 1024 * 1024  # 1MB chunks
+            
+            async with aiofiles.open(temp_file_path, "wb") as buffer:
+                while chunk := await file.read(chunk_size):
+                    file_size += len(chunk)
+                    if file_size > max_file_size:
+                        raise HTTPException(
+                            status_code=413, 
+                            detail=f"File too large. Maximum size allowed is 100MB, but file is {file_size / (1024*1024):.1f}MB"
+                        )
+                    await buffer.write(chunk)
+            
+            # Step 1: Transcribe with Whisper
+            print("Transcribing audio with Whisper...")
+            raw_transcript, num_chunks = await transcribe_with_whisper(temp_file_path, enforce_min_duration=True)
         
         # Step 2: Validate transcript quality
         is_valid, validation_message = validate_transcript_quality(raw_transcript)
         if not is_valid:
             raise HTTPException(status_code=400, detail=f"Transcript validation failed: {validation_message}")
         
-        # Step 3: Format transcript
-        print("Formatting transcript...")
-        formatted_transcript = format_with_openai(
-            raw_transcript, 
-            f"Please format this {job_role} interview transcript for {company_name} into a clear, well-structured format with proper paragraphs and speaker identification where possible, Dont include any other text in the response, just the formatted transcript. Dont use markdown formatting."
-        )
-        
-        # Step 4: Parallel analysis (can be done concurrently)
-        print("Performing comprehensive analysis...")
-        
-        # Run analyses in parallel for efficiency
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            # Submit all analysis tasks
-            skill_future = executor.submit(assess_skills_with_openai, raw_transcript, skills_list, job_role)
-            qa_future = executor.submit(extract_qa_with_openai, raw_transcript, job_role)
-            insights_future = executor.submit(generate_interview_insights_with_openai, raw_transcript, job_role)
-            
-            # Wait for all to complete
-            skill_assessments = skill_future.result()
-            questions_and_answers = qa_future.result()
-            interview_insights = insights_future.result()
+        # Formatting and analysis both consume raw_transcript, so run them
+        # concurrently instead of paying two LLM round-trips in series
+        print("Formatting transcript and performing comprehensive analysis...")
+        if needs_formatting(raw_transcript):
+            formatted_transcript, (skill_assessments, questions_and_answers, interview_insights) = await asyncio.gather(
+                format_with_openai(
+                    raw_transcript, 
+                    FORMAT_PROMPT_DETAILED + f" This is a {job_role} interview for {company_name}."
+                ),
+                analyze_interview_with_openai(raw_transcript, skills_list, job_role)
+            )
+        else:
+            # Input already has paragraph structure — skip the formatting call
+            formatted_transcript = raw_transcript
+            skill_assessments, questions_and_answers, interview_insights = await analyze_interview_with_openai(
+                raw_transcript, skills_list, job_role
+            )
         
         # Step 5: Generate executive summary
         print("Generating analysis summary...")
-        analysis_summary = generate_analysis_summary_with_openai(
-            skill_assessments, questions_and_answers, interview_insights, job_role
-        )
+        if summary_mode == "llm":
+            analysis_summary = await generate_analysis_summary_with_openai(
+                skill_assessments, questions_and_answers, interview_insights, job_role
+            )
+        else:
+            analysis_summary = render_analysis_summary_template(
+                skill_assessments, questions_and_answers, interview_insights, job_role
+            )
         
         # Step 6: Return comprehensive response
         return ComprehensiveAnalysisResponse(
@@ -1209,7 +1946,8 @@ async def analyze_interview_from_url(
     skills_to_assess: str = Form(..., description="Comma-separated list of skills to assess"),
     job_role: str = Form(default="Software Developer", description="Job role for context"),
     company_name: str = Form(default="Company", description="Company name for context"),
-    ai_provider: Literal["openai", "gemini"] = Form(default="openai")
+    ai_provider: Literal["openai", "gemini"] = Form(default="openai"),
+    summary_mode: Literal["template", "llm"] = Form(default="template", description="Render the executive summary from a template (fast, free) or with an extra LLM call")
 ):
     """
     Comprehensive interview analysis from video URL with skill assessment and insights
@@ -1222,12 +1960,7 @@ async def analyze_interview_from_url(
     """
     try:
         # Parse and validate skills
-        skills_list = [skill.strip() for skill in skills_to_assess.split(',') if skill.strip()]
-        if not skills_list:
-            raise HTTPException(status_code=400, detail="At least one skill must be provided")
-        
-        if len(skills_list) > 20:
-            raise HTTPException(status_code=400, detail="Maximum 20 skills allowed per analysis")
+        skills_list = parse_skills(skills_to_assess)
         
         # Validate AI provider
         if ai_provider != "openai":
@@ -1241,37 +1974,42 @@ async def analyze_interview_from_url(
         
         # Step 1: Download and transcribe
         print("Downloading and transcribing video...")
-        audio_file_path = download_audio_from_url(video_url)
-        raw_transcript, num_chunks = transcribe_with_whisper(audio_file_path)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            audio_file_path = await download_audio_from_url(video_url, temp_dir)
+            raw_transcript, num_chunks = await transcribe_with_whisper(audio_file_path, enforce_min_duration=True)
         
         # Step 2: Validate transcript quality
         is_valid, validation_message = validate_transcript_quality(raw_transcript)
         if not is_valid:
             raise HTTPException(status_code=400, detail=f"Transcript validation failed: {validation_message}")
         
-        # Step 3: Format transcript
-        print("Formatting transcript...")
-        formatted_transcript = format_with_openai(
-            raw_transcript, 
-            f"Please format this {job_role} interview transcript for {company_name} into a clear, well-structured format."
-        )
-        
-        # Step 4: Comprehensive analysis
-        print("Performing comprehensive analysis...")
-        
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            skill_future = executor.submit(assess_skills_with_openai, raw_transcript, skills_list, job_role)
-            qa_future = executor.submit(extract_qa_with_openai, raw_transcript, job_role)
-            insights_future = executor.submit(generate_interview_insights_with_openai, raw_transcript, job_role)
-            
-            skill_assessments = skill_future.result()
-            questions_and_answers = qa_future.result()
-            interview_insights = insights_future.result()
+        # Formatting and analysis both consume raw_transcript, so run them
+        # concurrently instead of paying two LLM round-trips in series
+        print("Formatting transcript and performing comprehensive analysis...")
+        if needs_formatting(raw_transcript):
+            formatted_transcript, (skill_assessments, questions_and_answers, interview_insights) = await asyncio.gather(
+                format_with_openai(
+                    raw_transcript, 
+                    FORMAT_PROMPT_SIMPLE + f" This is a {job_role} interview for {company_name}."
+                ),
+                analyze_interview_with_openai(raw_transcript, skills_list, job_role)
+            )
+        else:
+            # Input already has paragraph structure — skip the formatting call
+            formatted_transcript = raw_transcript
+            skill_assessments, questions_and_answers, interview_insights = await analyze_interview_with_openai(
+                raw_transcript, skills_list, job_role
+            )
         
         # Step 5: Generate summary
-        analysis_summary = generate_analysis_summary_with_openai(
-            skill_assessments, questions_and_answers, interview_insights, job_role
-        )
+        if summary_mode == "llm":
+            analysis_summary = await generate_analysis_summary_with_openai(
+                skill_assessments, questions_and_answers, interview_insights, job_role
+            )
+        else:
+            analysis_summary = render_analysis_summary_template(
+                skill_assessments, questions_and_answers, interview_insights, job_role
+            )
         
         return ComprehensiveAnalysisResponse(
             video_id=video_id,
@@ -1296,7 +2034,8 @@ async def analyze_transcript(
     skills_to_assess: str = Form(..., description="Comma-separated list of skills to assess"),
     job_role: str = Form(default="Software Developer", description="Job role for context"),
     company_name: str = Form(default="Company", description="Company name for context"),
-    ai_provider: Literal["openai", "gemini"] = Form(default="openai")
+    ai_provider: Literal["openai", "gemini"] = Form(default="openai"),
+    summary_mode: Literal["template", "llm"] = Form(default="template", description="Render the executive summary from a template (fast, free) or with an extra LLM call")
 ):
     """
     Comprehensive interview analysis from transcript text
@@ -1309,12 +2048,7 @@ async def analyze_transcript(
     """
     try:
         # Parse and validate skills
-        skills_list = [skill.strip() for skill in skills_to_assess.split(',') if skill.strip()]
-        if not skills_list:
-            raise HTTPException(status_code=400, detail="At least one skill must be provided")
-        
-        if len(skills_list) > 20:
-            raise HTTPException(status_code=400, detail="Maximum 20 skills allowed per analysis")
+        skills_list = parse_skills(skills_to_assess)
         
         # Validate AI provider
         if ai_provider != "openai":
@@ -1323,21 +2057,17 @@ async def analyze_transcript(
                 detail="Currently only OpenAI supports comprehensive structured analysis"
             )
         
-        # Save uploaded file temporarily
-        temp_dir = tempfile.mkdtemp()
-        temp_file_path = os.path.join(temp_dir, file.filename)
-        
+        # The upload is already in memory; decode it directly instead of
+        # round-tripping through a temp file
         content = await file.read()
-        with open(temp_file_path, "wb") as buffer:
-            buffer.write(content)
         
-        # Read the text or PDF file
         try:
             if file.filename.lower().endswith('.pdf'):
                 raw_transcript = extract_text_from_pdf(content)
             else:
-                with open(temp_file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    raw_transcript = f.read()
+                raw_transcript = content.decode("utf-8", errors="ignore")
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
         
@@ -1346,33 +2076,34 @@ async def analyze_transcript(
         if not is_valid:
             raise HTTPException(status_code=400, detail=f"Transcript validation failed: {validation_message}")
         
-        # Step 2: Format transcript
-        print("Formatting transcript...")
-        formatted_transcript = format_with_openai(
-            raw_transcript, 
-            f"Please format this {job_role} interview transcript for {company_name} into a clear, well-structured format with proper paragraphs and speaker identification where possible, Dont include any other text in the response, just the formatted transcript. Dont use markdown formatting."
-        )
-        
-        # Step 3: Parallel analysis (can be done concurrently)
-        print("Performing comprehensive analysis...")
-        
-        # Run analyses in parallel for efficiency
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            # Submit all analysis tasks
-            skill_future = executor.submit(assess_skills_with_openai, raw_transcript, skills_list, job_role)
-            qa_future = executor.submit(extract_qa_with_openai, raw_transcript, job_role)
-            insights_future = executor.submit(generate_interview_insights_with_openai, raw_transcript, job_role)
-            
-            # Wait for all to complete
-            skill_assessments = skill_future.result()
-            questions_and_answers = qa_future.result()
-            interview_insights = insights_future.result()
+        # Formatting and analysis both consume raw_transcript, so run them
+        # concurrently instead of paying two LLM round-trips in series
+        print("Formatting transcript and performing comprehensive analysis...")
+        if needs_formatting(raw_transcript):
+            formatted_transcript, (skill_assessments, questions_and_answers, interview_insights) = await asyncio.gather(
+                format_with_openai(
+                    raw_transcript, 
+                    FORMAT_PROMPT_DETAILED + f" This is a {job_role} interview for {company_name}."
+                ),
+                analyze_interview_with_openai(raw_transcript, skills_list, job_role)
+            )
+        else:
+            # Input already has paragraph structure — skip the formatting call
+            formatted_transcript = raw_transcript
+            skill_assessments, questions_and_answers, interview_insights = await analyze_interview_with_openai(
+                raw_transcript, skills_list, job_role
+            )
         
         # Step 4: Generate executive summary
         print("Generating analysis summary...")
-        analysis_summary = generate_analysis_summary_with_openai(
-            skill_assessments, questions_and_answers, interview_insights, job_role
-        )
+        if summary_mode == "llm":
+            analysis_summary = await generate_analysis_summary_with_openai(
+                skill_assessments, questions_and_answers, interview_insights, job_role
+            )
+        else:
+            analysis_summary = render_analysis_summary_template(
+                skill_assessments, questions_and_answers, interview_insights, job_role
+            )
         
         # Step 5: Return comprehensive response
         return ComprehensiveAnalysisResponse(
@@ -1393,36 +2124,32 @@ async def analyze_transcript(
     except Exception as e:
         # Handle unexpected errors
         raise HTTPException(status_code=500, detail=f"Error during transcript analysis: {str(e)}")
-    finally:
-        # Clean up temporary files
-        try:
-            if temp_dir and os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-        except Exception as cleanup_error:
-            print(f"Warning: Cleanup failed: {cleanup_error}")
 
 @app.post("/compare-analyses", response_model=ComparisonResponse)
 async def compare_pdf_analyses(
     original_analysis: UploadFile = File(...),
     ai_analysis: UploadFile = File(...),
+    mode: Literal["sync", "batch"] = Form(default="sync"),
 ):
     """
     Compare original and AI-generated interview analyses
-    
+
     - **original_analysis**: PDF file with original human analysis
     - **ai_analysis**: PDF file with AI-generated analysis
+    - **mode**: "sync" returns the comparison directly; "batch" submits it via
+      the OpenAI Batch API (half the cost, up to 24h) and returns a batch_id
+      to poll on /batch-status/{batch_id}
     """
     try:
         # Read uploaded files
         original_content = await original_analysis.read()
-        await original_analysis.seek(0)  # Reset file pointer
-        
         ai_content = await ai_analysis.read()
-        await ai_analysis.seek(0)  # Reset file pointer
         
-        # Extract text from PDFs
-        original_text = extract_text_from_pdf(original_content)
-        ai_text = extract_text_from_pdf(ai_content)
+        # Extract text from both PDFs concurrently
+        original_text, ai_text = await asyncio.gather(
+            asyncio.to_thread(extract_text_from_pdf, original_content),
+            asyncio.to_thread(extract_text_from_pdf, ai_content),
+        )
         
         # Validate extracted text
         if len(original_text) < 100 or len(ai_text) < 100:
@@ -1431,11 +2158,20 @@ async def compare_pdf_analyses(
                 detail="Failed to extract sufficient text from one or both PDFs"
             )
         
+        # Offline reports can tolerate latency: hand the work to the Batch
+        # API for a 50% discount and a separate rate-limit pool
+        if mode == "batch":
+            batch_id = await submit_comparison_batch(original_text, ai_text)
+            return ORJSONResponse(
+                status_code=202,
+                content={"batch_id": batch_id, "status": "submitted"},
+            )
+
         # Compare analyses using OpenAI
-        comparison_result = compare_analyses_with_openai(original_text, ai_text)
-        
+        comparison_result = await compare_analyses_with_openai(original_text, ai_text)
+
         return comparison_result
-        
+
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
@@ -1443,6 +2179,40 @@ async def compare_pdf_analyses(
         # Handle unexpected errors
         raise HTTPException(status_code=500, detail=f"Error comparing analyses: {str(e)}")
 
+@app.get("/batch-status/{batch_id}")
+async def get_batch_status(batch_id: str):
+    """
+    Poll a comparison submitted with mode=batch; returns the finished
+    ComparisonResponse once OpenAI marks the batch completed
+    """
+    client = get_async_openai_client()
+
+    try:
+        batch = await client.batches.retrieve(batch_id)
+
+        if batch.status != "completed":
+            return {"batch_id": batch_id, "status": batch.status}
+
+        output = await client.files.content(batch.output_file_id)
+        result_line = orjson.loads(output.text.splitlines()[0])
+        body = result_line["response"]["body"]
+        result_dict = orjson.loads(body["choices"][0]["message"]["content"])
+
+        return {
+            "batch_id": batch_id,
+            "status": "completed",
+            "result": _build_comparison_response(result_dict),
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving batch status: {str(e)}")
+
+def _sse_event(payload: dict) -> bytes:
+    """Serialize one SSE data event with orjson (bytes straight to the wire)"""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
 @app.post("/extract-transcript-stream")
 async def extract_and_format_transcript_stream(request: TranscriptRequest):
     """
@@ -1450,23 +2220,38 @@ async def extract_and_format_transcript_stream(request: TranscriptRequest):
     """
     async def generate_progress():
         try:
-            # Step 1: Download audio
-            yield f"data: {json.dumps({'step': 'downloading', 'message': 'Downloading audio from video...'})}\n\n"
+            # Open the stream immediately so proxies commit to streaming
+            # before the first slow stage starts
+            yield b": ping\n\n"
             
-            audio_file_path = download_audio_from_url(request.video_url)
-            
-            # Step 2: Transcribe
-            yield f"data: {json.dumps({'step': 'transcribing', 'message': 'Transcribing audio with Whisper...'})}\n\n"
+            # Step 1: Download audio
+            yield _sse_event({'step': 'downloading', 'message': 'Downloading audio from video...'})
             
-            raw_transcript, num_chunks = transcribe_with_whisper(audio_file_path)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                audio_file_path = await download_audio_from_url(request.video_url, temp_dir)
+                
+                # Step 2: Transcribe
+                yield _sse_event({'step': 'transcribing', 'message': 'Transcribing audio with Whisper...'})
+                
+                raw_transcript, num_chunks = await transcribe_with_whisper(audio_file_path)
             
             # Step 3: Format with AI
-            yield f"data: {json.dumps({'step': 'formatting', 'message': 'Formatting transcript with AI...'})}\n\n"
+            yield _sse_event({'step': 'formatting', 'message': 'Formatting transcript with AI...'})
             
             if request.ai_provider == "openai":
-                formatted_response = format_with_openai(raw_transcript, request.format_prompt)
+                # Stream formatted tokens as they arrive so the client sees
+                # output immediately instead of waiting for the full completion
+                cache_key = _format_cache_key(f"openai/{FORMAT_MODEL}", request.format_prompt, raw_transcript)
+                formatted_response = _format_cache_get(cache_key)
+                if formatted_response is None:
+                    formatted_parts = []
+                    async for token in stream_format_with_openai(raw_transcript, request.format_prompt):
+                        formatted_parts.append(token)
+                        yield _sse_event({'step': 'formatting_token', 'token': token})
+                    formatted_response = "".join(formatted_parts)
+                    _format_cache_put(cache_key, formatted_response)
             elif request.ai_provider == "gemini":
-                formatted_response = format_with_gemini(raw_transcript, request.format_prompt)
+                formatted_response = await format_with_gemini(raw_transcript, request.format_prompt)
             else:
                 raise HTTPException(status_code=400, detail="Invalid AI provider")
             
@@ -1479,17 +2264,24 @@ async def extract_and_format_transcript_stream(request: TranscriptRequest):
                 file_chunks=num_chunks
             )
             
-            yield f"data: {json.dumps({'step': 'complete', 'result': result.dict()})}\n\n"
+            yield _sse_event({'step': 'complete', 'result': result.model_dump()})
             
         except Exception as e:
-            yield f"data: {json.dumps({'step': 'error', 'error': str(e)})}\n\n"
+            yield _sse_event({'step': 'error', 'error': str(e)})
     
+    # text/event-stream (not text/plain) so nginx/Cloudflare deliver events
+    # as they are produced; X-Accel-Buffering disables proxy buffering that
+    # would otherwise hold events until a buffer fills
     return StreamingResponse(
         generate_progress(),
-        media_type="text/plain",
-        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"}
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        }
     )
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, loop="uvloop", http="httptools", ws="none", workers=os.cpu_count())
@@ -3,45 +3,45 @@
 Test script to verify API endpoints and timeout handling
 """
 
-import requests
-import time
-import json
+import asyncio
+
+import httpx
 
 # Configuration
 BASE_URL = "http://localhost:8000"  # Change this to your API URL
 TIMEOUT = 30  # 30 seconds timeout for requests
 
-def test_health_endpoint():
+async def test_health_endpoint(client: httpx.AsyncClient):
     """Test the health endpoint"""
     print("Testing health endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=TIMEOUT)
+        response = await client.get("/health")
         print(f"Health Status: {response.status_code}")
         print(f"Response: {response.json()}")
         return response.status_code == 200
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         print("❌ Health endpoint timed out")
         return False
     except Exception as e:
         print(f"❌ Health endpoint error: {e}")
         return False
 
-def test_root_endpoint():
+async def test_root_endpoint(client: httpx.AsyncClient):
     """Test the root endpoint"""
     print("\nTesting root endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/", timeout=TIMEOUT)
+        response = await client.get("/")
         print(f"Root Status: {response.status_code}")
         print(f"Response: {response.json()}")
         return response.status_code == 200
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         print("❌ Root endpoint timed out")
         return False
     except Exception as e:
         print(f"❌ Root endpoint error: {e}")
         return False
 
-def test_transcript_endpoint():
+async def test_transcript_endpoint(client: httpx.AsyncClient):
     """Test the transcript endpoint with a simple request"""
     print("\nTesting transcript endpoint...")
     try:
@@ -50,14 +50,10 @@ def test_transcript_endpoint():
             "video_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",  # Rick Roll
             "ai_provider": "openai"
         }
-        
-        response = requests.post(
-            f"{BASE_URL}/extract-transcript", 
-            json=data, 
-            timeout=TIMEOUT
-        )
+
+        response = await client.post("/extract-transcript", json=data)
         print(f"Transcript Status: {response.status_code}")
-        
+
         if response.status_code == 200:
             print("✅ Transcript endpoint working")
             return True
@@ -68,47 +64,42 @@ def test_transcript_endpoint():
         else:
             print(f"❌ Unexpected status: {response.status_code}")
             return False
-            
-    except requests.exceptions.Timeout:
+
+    except httpx.TimeoutException:
         print("❌ Transcript endpoint timed out (524 error likely)")
         return False
     except Exception as e:
         print(f"❌ Transcript endpoint error: {e}")
         return False
 
-def main():
-    """Run all tests"""
+async def main():
+    """Run all tests concurrently over one pooled connection"""
     print("🚀 Testing FastAPI endpoints for timeout issues...")
     print(f"Base URL: {BASE_URL}")
     print(f"Timeout: {TIMEOUT} seconds")
-    
-    tests = [
-        test_health_endpoint,
-        test_root_endpoint,
-        test_transcript_endpoint
-    ]
-    
-    results = []
-    for test in tests:
-        try:
-            result = test()
-            results.append(result)
-        except Exception as e:
-            print(f"❌ Test failed with exception: {e}")
-            results.append(False)
-    
+
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=TIMEOUT) as client:
+        results = await asyncio.gather(
+            test_health_endpoint(client),
+            test_root_endpoint(client),
+            test_transcript_endpoint(client),
+            return_exceptions=True,
+        )
+
+    results = [bool(r) and not isinstance(r, Exception) for r in results]
+
     print(f"\n📊 Test Results:")
     print(f"Passed: {sum(results)}/{len(results)}")
-    
+
     if all(results):
         print("✅ All tests passed! API should be working correctly.")
     else:
         print("❌ Some tests failed. Check the API configuration.")
-        
+
         if not results[0]:  # Health check failed
             print("💡 Suggestion: Check if the API server is running")
         if not results[2]:  # Transcript endpoint failed
             print("💡 Suggestion: Check API keys and timeout configurations")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main())